@@ -289,7 +289,7 @@ def main():
                         with col3:
                             st.metric("Processing Time", f"{session.total_processing_time/1000:.1f}s")
                         with col4:
-                            tokens = sum(r.tokens_used for r in session.recommendations if not r.recommendation.startswith('ERROR:'))
+                            tokens = sum(r.tokens_used for r in session.recommendations if not r.has_error)
                             st.metric("Tokens Used", tokens)
 
                 except Exception as e:
@@ -349,7 +349,7 @@ def main():
 
             for i, rec in enumerate(session.recommendations):
                 with st.expander(f"Window {rec.window_index + 1} ({rec.window_start_time:.1f}s - {rec.window_end_time:.1f}s)"):
-                    if rec.recommendation.startswith('ERROR:'):
+                    if rec.has_error:
                         st.error(rec.recommendation)
                     else:
                         st.write(rec.recommendation)
@@ -21,6 +21,7 @@ from src.enhanced_window_processor import EnhancedWindowProcessor
 from src.context_manager import ContextManager
 from src.gpt5_client import GPT5Client
 from src.batch_processor import BatchProcessor, BatchJobConfig
+from src.response_cache import default_response_cache
 
 
 # Page configuration
@@ -90,6 +91,9 @@ def init_session_state():
         db_path = Path("coaching_sessions.db")
         st.session_state.db_manager = DatabaseManager(str(db_path))
 
+    if 'response_cache' not in st.session_state:
+        st.session_state.response_cache = default_response_cache()
+
     if 'current_session_id' not in st.session_state:
         st.session_state.current_session_id = None
 
@@ -537,7 +541,7 @@ def process_next_window():
             st.error("❌ OpenAI API Key not configured")
             return
 
-        gpt5_client = GPT5Client(api_key)
+        gpt5_client = GPT5Client(api_key, response_cache=st.session_state.response_cache)
 
         # Update progress
         st.session_state.processing_progress = {
@@ -548,13 +552,14 @@ def process_next_window():
 
         # Create window in database
         window_id = f"{session_id}_window_{window_number}"
+        window_data = window.to_dict()
         st.session_state.db_manager.create_window(
             window_id=window_id,
             session_id=session_id,
             window_number=window_number,
             start_time=window.start_time,
             end_time=window.end_time,
-            input_data=window.to_dict()
+            input_data=window_data
         )
 
         # Build context for this window
@@ -572,25 +577,25 @@ def process_next_window():
                 result = loop.run_until_complete(gpt5_client.analyze_window_with_context(
                     system_prompt=session['processing_config'].system_prompt,
                     context_prompt=context_prompt,
-                    window_data=window.to_dict(),
+                    window_data=window_data,
                     config=session['gpt_config']
                 ))
 
-                # Save results
-                st.session_state.db_manager.update_window_status(
-                    window_id=window_id,
-                    status=WindowStatus.COMPLETED,
-                    output_data=result.to_dict(),
-                    processing_time=result.processing_time_seconds
-                )
+                # Save results, context and recommendations with a single commit
+                with st.session_state.db_manager.transaction():
+                    st.session_state.db_manager.update_window_status(
+                        window_id=window_id,
+                        status=WindowStatus.COMPLETED,
+                        output_data=result.to_dict(),
+                        processing_time=result.processing_time_seconds
+                    )
 
-                # Save context and recommendations
-                context_manager.save_window_context(
-                    session_id=session_id,
-                    window_number=window_number,
-                    window_context=window_processor.extract_window_context(window),
-                    analysis_result=result.content
-                )
+                    context_manager.save_window_context(
+                        session_id=session_id,
+                        window_number=window_number,
+                        window_context=window_processor.extract_window_context(window),
+                        analysis_result=result.content
+                    )
 
                 st.success(f"✅ Window {window_number} processed successfully!")
 
@@ -650,7 +655,7 @@ def process_all_remaining_windows():
             st.error("❌ OpenAI API Key not configured")
             return
 
-        gpt5_client = GPT5Client(api_key)
+        gpt5_client = GPT5Client(api_key, response_cache=st.session_state.response_cache)
 
         # Process remaining windows
         for i in range(current_index, total_windows):
@@ -669,13 +674,14 @@ def process_all_remaining_windows():
             try:
                 # Create window in database
                 window_id = f"{session_id}_window_{window_number}"
+                window_data = window.to_dict()
                 st.session_state.db_manager.create_window(
                     window_id=window_id,
                     session_id=session_id,
                     window_number=window_number,
                     start_time=window.start_time,
                     end_time=window.end_time,
-                    input_data=window.to_dict()
+                    input_data=window_data
                 )
 
                 # Build context for this window
@@ -692,11 +698,15 @@ def process_all_remaining_windows():
                     result = loop.run_until_complete(gpt5_client.analyze_window_with_context(
                         system_prompt=session['processing_config'].system_prompt,
                         context_prompt=context_prompt,
-                        window_data=window.to_dict(),
+                        window_data=window_data,
                         config=session['gpt_config']
                     ))
 
-                    # Save results
+                finally:
+                    loop.close()
+
+                # Save results, context, recommendations and session progress with a single commit
+                with st.session_state.db_manager.transaction():
                     st.session_state.db_manager.update_window_status(
                         window_id=window_id,
                         status=WindowStatus.COMPLETED,
@@ -704,7 +714,6 @@ def process_all_remaining_windows():
                         processing_time=result.processing_time_seconds
                     )
 
-                    # Save context and recommendations
                     context_manager.save_window_context(
                         session_id=session_id,
                         window_number=window_number,
@@ -712,13 +721,9 @@ def process_all_remaining_windows():
                         analysis_result=result.content
                     )
 
-                finally:
-                    loop.close()
-
-                # Update session progress
-                st.session_state.db_manager.update_session_status(
-                    session_id, SessionStatus.PROCESSING, completed_windows=window_number
-                )
+                    st.session_state.db_manager.update_session_status(
+                        session_id, SessionStatus.PROCESSING, completed_windows=window_number
+                    )
 
             except Exception as e:
                 st.error(f"❌ Error processing window {window_number}: {e}")
@@ -983,7 +988,8 @@ def render_batch_processing_interface():
     if st.session_state.batch_processor is None and os.environ.get("OPENAI_API_KEY"):
         st.session_state.batch_processor = BatchProcessor(
             st.session_state.db_manager,
-            os.environ.get("OPENAI_API_KEY")
+            os.environ.get("OPENAI_API_KEY"),
+            response_cache=st.session_state.response_cache
         )
 
     if st.session_state.batch_processor is None:
@@ -1154,8 +1160,9 @@ def render_batch_job_status(job_progress):
             st.progress(progress_pct)
 
         # Active sessions
-        if job_progress.active_sessions:
-            st.write(f"**Active Sessions:** {', '.join([s[:8] + '...' for s in job_progress.active_sessions])}")
+        active_sessions = job_progress.get_active_sessions()
+        if active_sessions:
+            st.write(f"**Active Sessions:** {', '.join([s[:8] + '...' for s in active_sessions])}")
 
         st.divider()
 
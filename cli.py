@@ -59,6 +59,7 @@ def cli(debug: bool):
 @click.option('--model', type=str, help='OpenAI model to use')
 @click.option('--reasoning-effort', type=click.Choice(['minimal', 'low', 'medium', 'high']),
               help='GPT-5 reasoning effort')
+@click.option('--resume', type=str, help='Session ID of an interrupted run to resume')
 def process(
     input_file: Path,
     interval: Optional[float],
@@ -66,7 +67,8 @@ def process(
     output: Optional[Path],
     format: str,
     model: Optional[str],
-    reasoning_effort: Optional[str]
+    reasoning_effort: Optional[str],
+    resume: Optional[str]
 ):
     """Process frame descriptions and generate coaching recommendations."""
     try:
@@ -87,7 +89,8 @@ def process(
             frame_data=input_file,
             interval_minutes=interval,
             template_type=template,
-            api_settings=api_settings if api_settings else None
+            api_settings=api_settings if api_settings else None,
+            session_id=resume
         )
 
         # Export results
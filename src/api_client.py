@@ -5,15 +5,71 @@ Handles API calls, retries, and tool usage for research-enhanced coaching recomm
 
 import asyncio
 import json
+import threading
 import time
 import logging
 from typing import Dict, List, Optional, Any, Union
-from openai import OpenAI, AsyncOpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError
 from .config import Config
 from .utils import setup_logging
 
 logger = setup_logging(__name__)
 
+class RateLimiter:
+    """
+    Thread-safe token bucket for API requests.
+
+    Allows up to max_per_minute requests, bursting at most one second's worth. A rate-limit
+    response halves the rate and honors Retry-After; the rate then doubles back toward the
+    maximum after each quiet cooldown period.
+    """
+
+    def __init__(self, max_per_minute: int, cooldown_seconds: float = 60.0):
+        self.max_rate = max_per_minute / 60.0
+        self.min_rate = self.max_rate / 64
+        self.rate = self.max_rate
+        self.capacity = max(1.0, self.max_rate)
+        self.cooldown_seconds = cooldown_seconds
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.rate < self.max_rate and now >= self._cooldown_until:
+                    self.rate = min(self.max_rate, self.rate * 2)
+                    self._cooldown_until = now + self.cooldown_seconds
+
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Slow down after a rate-limit response."""
+
+        with self._lock:
+            now = time.monotonic()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._cooldown_until = now + self.cooldown_seconds
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
 class APIClient:
     """OpenAI API client with GPT-5 and tool support."""
 
@@ -31,6 +87,7 @@ class APIClient:
         self.timeout = Config.TIMEOUT_MS / 1000  # Convert to seconds
         self.max_retries = Config.RETRY_ATTEMPTS
         self.retry_delay = 2.0
+        self.rate_limiter = RateLimiter(Config.MAX_RPM)
 
     def generate_recommendation(
         self,
@@ -53,16 +110,9 @@ class APIClient:
         """
         start_time = time.time()
 
-        # Merge settings
-        api_settings = Config.get_api_settings()
-        if settings:
-            api_settings.update(settings)
-
-        # Ensure we're using GPT-5 for complex coaching analysis
-        model_name = api_settings.get('model_name', 'gpt-5')
-        if 'nano' in model_name:
-            logger.warning(f"Switching from {model_name} to gpt-5 for coaching analysis")
-            model_name = 'gpt-5'
+        # Merge settings, ensuring we're using GPT-5 for complex coaching analysis
+        api_settings = self._resolve_settings(settings)
+        model_name = api_settings['model_name']
 
         # Build complete user input
         user_input = self._build_user_input(system_prompt, user_prompt, frame_context)
@@ -87,6 +137,13 @@ class APIClient:
     ) -> Dict[str, Any]:
         """Call GPT-5 using the Responses API with proper format and parameters."""
 
+        payload = self._build_gpt5_payload(user_input, settings)
+        response = self._make_api_call_with_retry(payload, use_responses_api=True)
+        return self._parse_gpt5_response(response, start_time, settings)
+
+    def _build_gpt5_payload(self, user_input: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the Responses API request body for GPT-5."""
+
         # GPT-5 uses Responses API with specific format
         payload = {
             "model": settings.get('model_name', 'gpt-5'),
@@ -115,8 +172,7 @@ class APIClient:
 
         # Note: temperature is NOT supported by GPT-5 - removed
 
-        response = self._make_api_call_with_retry(payload, use_responses_api=True)
-        return self._parse_gpt5_response(response, start_time, settings)
+        return payload
 
     def _call_chat_completion(
         self,
@@ -126,6 +182,13 @@ class APIClient:
     ) -> Dict[str, Any]:
         """Call Chat Completions API for non-GPT-5 models."""
 
+        payload = self._build_chat_payload(user_input, settings)
+        response = self._make_api_call_with_retry(payload, use_tools=False)
+        return self._parse_chat_response(response, start_time, settings)
+
+    def _build_chat_payload(self, user_input: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the Chat Completions request body for non-GPT-5 models."""
+
         payload = {
             "model": settings.get('model_name', 'gpt-4'),
             "messages": [
@@ -140,8 +203,125 @@ class APIClient:
             payload['max_tokens'] = settings['max_tokens']
         # Note: temperature parameter removed - not consistent across all models
 
-        response = self._make_api_call_with_retry(payload, use_tools=False)
-        return self._parse_chat_response(response, start_time, settings)
+        return payload
+
+    def _resolve_settings(self, settings: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge settings overrides onto the configured defaults, forcing GPT-5 over nano models."""
+
+        api_settings = Config.get_api_settings()
+        if settings:
+            api_settings.update(settings)
+
+        model_name = api_settings.get('model_name', 'gpt-5')
+        if 'nano' in model_name:
+            logger.warning(f"Switching from {model_name} to gpt-5 for coaching analysis")
+            api_settings['model_name'] = 'gpt-5'
+
+        return api_settings
+
+    def build_batch_request(
+        self,
+        custom_id: str,
+        system_prompt: str,
+        user_prompt: str,
+        frame_context: str,
+        settings: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build one Batch API input line for a recommendation request.
+
+        Args:
+            custom_id: Identifier echoed back on the matching output line
+            system_prompt: System prompt defining AI role
+            user_prompt: User instructions for analysis
+            frame_context: Frame descriptions and context
+            settings: Optional API settings override
+
+        Returns:
+            Dictionary with custom_id, method, url and body
+        """
+        api_settings = self._resolve_settings(settings)
+        user_input = self._build_user_input(system_prompt, user_prompt, frame_context)
+
+        if api_settings['model_name'].startswith('gpt-5'):
+            url = '/v1/responses'
+            body = self._build_gpt5_payload(user_input, api_settings)
+        else:
+            url = '/v1/chat/completions'
+            body = self._build_chat_payload(user_input, api_settings)
+
+        return {'custom_id': custom_id, 'method': 'POST', 'url': url, 'body': body}
+
+    def submit_batch(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Upload batch request lines as a JSONL file and create a Batch API job.
+
+        Args:
+            requests: Lines built by build_batch_request (all must share one url)
+
+        Returns:
+            The created batch as a dictionary
+        """
+        jsonl = '\n'.join(json.dumps(request) for request in requests) + '\n'
+        input_file = self.client.files.create(
+            file=('coaching_batch.jsonl', jsonl.encode('utf-8')),
+            purpose='batch'
+        )
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=requests[0]['url'],
+            completion_window='24h'
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+        return batch.model_dump()
+
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Fetch the current state of a Batch API job."""
+
+        return self.client.batches.retrieve(batch_id).model_dump()
+
+    def read_batch_results(
+        self,
+        batch: Dict[str, Any],
+        settings: Optional[Dict[str, Any]],
+        start_time: float
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Download a finished batch's output and parse each line like a realtime response.
+
+        Args:
+            batch: Batch dictionary from retrieve_batch
+            settings: Settings the requests were built with
+            start_time: Submission time, used for processing_time
+
+        Returns:
+            Mapping of custom_id to parsed response, or to {'error': message} for failed lines
+        """
+        api_settings = self._resolve_settings(settings)
+        results = {}
+
+        for file_id in (batch.get('output_file_id'), batch.get('error_file_id')):
+            if not file_id:
+                continue
+
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                response = record.get('response') or {}
+                custom_id = record.get('custom_id')
+
+                if record.get('error') or response.get('status_code') != 200:
+                    error = record.get('error') or response.get('body', {}).get('error') or 'Batch request failed'
+                    results[custom_id] = {'error': error.get('message', str(error)) if isinstance(error, dict) else str(error)}
+                elif batch.get('endpoint') == '/v1/responses':
+                    results[custom_id] = self._parse_gpt5_response(response['body'], start_time, api_settings)
+                else:
+                    results[custom_id] = self._parse_chat_response(response['body'], start_time, api_settings)
+
+        return results
 
     def _make_api_call_with_retry(
         self,
@@ -154,6 +334,7 @@ class APIClient:
         attempt = 1
         while attempt <= self.max_retries:
             try:
+                self.rate_limiter.acquire()
                 logger.info(f"API call attempt {attempt} (model: {payload.get('model', 'unknown')})")
 
                 if use_responses_api:
@@ -165,6 +346,21 @@ class APIClient:
                     response = self.client.chat.completions.create(**payload)
                     return response.model_dump()
 
+            except RateLimitError as error:
+                retry_after = self._get_retry_after(error)
+                self.rate_limiter.penalize(retry_after)
+                if attempt < self.max_retries:
+                    # The limiter holds the next acquire() until Retry-After has passed
+                    logger.warning(f"Rate limited (attempt {attempt}), slowing to {self.rate_limiter.rate * 60:.0f} RPM: {error}")
+                    if retry_after is None:
+                        # Without a Retry-After the bucket may still hold tokens, so back off as for other errors
+                        time.sleep(self.retry_delay * attempt)
+                    attempt += 1
+                    continue
+                else:
+                    logger.error(f"API call failed after {self.max_retries} attempts: {error}")
+                    raise error
+
             except Exception as error:
                 if attempt < self.max_retries:
                     delay = self.retry_delay * attempt
@@ -176,6 +372,14 @@ class APIClient:
                     logger.error(f"API call failed after {self.max_retries} attempts: {error}")
                     raise error
 
+    def _get_retry_after(self, error: RateLimitError) -> Optional[float]:
+        """Read the Retry-After header from a rate-limit error, if present."""
+
+        try:
+            return float(error.response.headers.get('retry-after'))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
     def _parse_gpt5_response(
         self,
         response: Dict[str, Any],
@@ -5,19 +5,30 @@ Enables processing multiple frame description files concurrently with progress t
 
 import asyncio
 import os
+import threading
 import uuid
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Callable
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from dataclasses import dataclass, field
 
 from loguru import logger
+from openai import OpenAI
 
 from .database import DatabaseManager, GPTConfig, ProcessingConfig, SessionStatus, WindowStatus
-from .enhanced_window_processor import EnhancedWindowProcessor
+from .enhanced_window_processor import EnhancedWindowProcessor, ProcessingWindow
 from .context_manager import ContextManager
 from .gpt5_client import GPT5Client
+from .response_cache import ResponseCache
+from .utils import DATACLASS_OPTIONS
+
+
+# Upper bound for a single exponential-backoff sleep between window retries
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+# Number of files parsed for a batch estimate; the rest is extrapolated by file size
+ESTIMATE_SAMPLE_FILES = 5
 
 
 @dataclass
@@ -30,7 +41,16 @@ class BatchJobConfig:
     max_retries_per_window: int = 2
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_OPTIONS)
+class ValidatedFile:
+    """An input file that exists on disk, with its name and size resolved once."""
+    path: str
+    stem: str
+    size: int
+    mtime: float
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class BatchProgress:
     job_id: str
     total_sessions: int
@@ -40,22 +60,89 @@ class BatchProgress:
     overall_status: str
     start_time: datetime
     estimated_completion: Optional[datetime] = None
+    # Guards the counters and active_sessions; read from UI threads while workers update them
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def record_session_started(self, session_id: str) -> None:
+        with self._lock:
+            self.active_sessions.append(session_id)
+
+    def record_session_finished(self, session_id: Optional[str], success: bool) -> None:
+        with self._lock:
+            if success:
+                self.completed_sessions += 1
+            else:
+                self.failed_sessions += 1
+            if session_id in self.active_sessions:
+                self.active_sessions.remove(session_id)
+
+    def get_active_sessions(self) -> List[str]:
+        with self._lock:
+            return list(self.active_sessions)
 
     @property
     def completion_percentage(self) -> float:
-        if self.total_sessions == 0:
+        with self._lock:
+            total = self.total_sessions
+            finished = self.completed_sessions + self.failed_sessions
+        if total == 0:
             return 0.0
-        return (self.completed_sessions + self.failed_sessions) / self.total_sessions * 100
+        return finished / total * 100
 
 
 class BatchProcessor:
     """Handles batch processing of multiple frame description files."""
 
-    def __init__(self, db_manager: DatabaseManager, api_key: str):
+    def __init__(self, db_manager: DatabaseManager, api_key: str,
+                 response_cache: Optional[ResponseCache] = None):
         self.db_manager = db_manager
         self.api_key = api_key
         self.active_jobs: Dict[str, BatchProgress] = {}
         self.executor = ThreadPoolExecutor(max_workers=5)
+        # One OpenAI client (and keep-alive connection pool) shared by every session
+        self._openai_client: Optional[OpenAI] = None
+        # Caller-owned persistent response cache shared by every session's client, so reruns
+        # skip paid calls; None disables caching
+        self._response_cache = response_cache
+        # Per-file (frame count, window count, first window) keyed by file identity and window size
+        self._parse_cache: Dict[Tuple[str, int, float, int], Tuple[int, int, Optional[ProcessingWindow]]] = {}
+
+    def _create_gpt5_client(self) -> GPT5Client:
+        """Create a GPT-5 client that reuses the processor's shared connection pool and response cache."""
+        if self._openai_client is None:
+            self._openai_client = OpenAI(api_key=self.api_key)
+        return GPT5Client(self.api_key, client=self._openai_client, response_cache=self._response_cache)
+
+    def close(self):
+        """Release pooled API connections and worker threads."""
+        if self._openai_client is not None:
+            self._openai_client.close()
+            self._openai_client = None
+        self.executor.shutdown(wait=False)
+
+    @staticmethod
+    def _estimate_sample(files: List[ValidatedFile]) -> List[ValidatedFile]:
+        """Pick up to ESTIMATE_SAMPLE_FILES files spread evenly across the size range, the same on every call."""
+        by_size = sorted(files, key=lambda f: (f.size, f.path))
+        if len(by_size) <= ESTIMATE_SAMPLE_FILES:
+            return by_size
+        step = (len(by_size) - 1) / (ESTIMATE_SAMPLE_FILES - 1)
+        return [by_size[round(index * step)] for index in range(ESTIMATE_SAMPLE_FILES)]
+
+    @staticmethod
+    def _resolve_input_files(input_files: List[str]) -> List[ValidatedFile]:
+        """Stat each input path once, dropping files that do not exist."""
+        resolved = []
+        for file_path in input_files:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                logger.warning(f"Input file not found: {file_path}")
+                continue
+            resolved.append(ValidatedFile(
+                path=file_path, stem=Path(file_path).stem, size=stat.st_size, mtime=stat.st_mtime
+            ))
+        return resolved
 
     async def start_batch_job(
         self,
@@ -68,19 +155,15 @@ class BatchProcessor:
 
         # Validate input files
         valid_files = []
-        for file_path in job_config.input_files:
-            if not os.path.exists(file_path):
-                logger.warning(f"Input file not found: {file_path}")
-                continue
-
+        processor = EnhancedWindowProcessor()
+        for input_file in self._resolve_input_files(job_config.input_files):
             # Validate JSON structure
-            processor = EnhancedWindowProcessor()
-            is_valid, message = processor.validate_json_structure(file_path)
+            is_valid, message = processor.validate_json_structure(input_file.path)
             if not is_valid:
-                logger.warning(f"Invalid JSON structure in {file_path}: {message}")
+                logger.warning(f"Invalid JSON structure in {input_file.path}: {message}")
                 continue
 
-            valid_files.append(file_path)
+            valid_files.append(input_file)
 
         if not valid_files:
             raise ValueError("No valid input files found")
@@ -111,7 +194,7 @@ class BatchProcessor:
         self,
         job_id: str,
         job_config: BatchJobConfig,
-        input_files: List[str],
+        input_files: List[ValidatedFile],
         progress_callback: Optional[Callable[[BatchProgress], None]] = None
     ):
         """Process multiple sessions in parallel."""
@@ -124,10 +207,10 @@ class BatchProcessor:
 
         # Create tasks for all sessions
         tasks = []
-        for file_path in input_files:
+        for input_file in input_files:
             task = asyncio.create_task(
                 self._process_single_session_with_semaphore(
-                    semaphore, job_id, file_path, job_config
+                    semaphore, job_id, input_file, job_config
                 )
             )
             tasks.append(task)
@@ -137,23 +220,22 @@ class BatchProcessor:
             try:
                 session_result = await completed_task
 
+                # Update counters and the active sessions list together
+                batch_progress.record_session_finished(
+                    session_result['session_id'], session_result['success']
+                )
+
                 if session_result['success']:
-                    batch_progress.completed_sessions += 1
                     logger.info(f"Completed session: {session_result['session_id']}")
                 else:
-                    batch_progress.failed_sessions += 1
                     logger.error(f"Failed session: {session_result.get('error', 'Unknown error')}")
 
-                # Update active sessions list
-                if session_result['session_id'] in batch_progress.active_sessions:
-                    batch_progress.active_sessions.remove(session_result['session_id'])
-
                 # Call progress callback
                 if progress_callback:
                     progress_callback(batch_progress)
 
             except Exception as e:
-                batch_progress.failed_sessions += 1
+                batch_progress.record_session_finished(None, success=False)
                 logger.error(f"Error in batch processing task: {e}")
 
         # Mark job as completed
@@ -165,7 +247,7 @@ class BatchProcessor:
         self,
         semaphore: asyncio.Semaphore,
         job_id: str,
-        file_path: str,
+        input_file: ValidatedFile,
         job_config: BatchJobConfig
     ) -> Dict[str, Any]:
         """Process a single session with concurrency control."""
@@ -179,11 +261,9 @@ class BatchProcessor:
 
                 # Add to active sessions
                 batch_progress = self.active_jobs[job_id]
-                batch_progress.active_sessions.append(session_id)
+                batch_progress.record_session_started(session_id)
 
-                # Extract session name from file path
-                file_name = Path(file_path).stem
-                session_name = f"{job_config.name} - {file_name}"
+                session_name = f"{job_config.name} - {input_file.stem}"
 
                 # Create session in database
                 success = self.db_manager.create_session(
@@ -191,7 +271,7 @@ class BatchProcessor:
                     name=session_name,
                     gpt_config=job_config.gpt_config,
                     processing_config=job_config.processing_config,
-                    input_file_path=file_path
+                    input_file_path=input_file.path
                 )
 
                 if not success:
@@ -203,13 +283,13 @@ class BatchProcessor:
 
                 # Process the session
                 result = await self._process_session_windows(
-                    session_id, file_path, job_config
+                    session_id, input_file.path, job_config
                 )
 
                 return {
                     'success': result,
                     'session_id': session_id,
-                    'file_path': file_path
+                    'file_path': input_file.path
                 }
 
             except Exception as e:
@@ -234,23 +314,33 @@ class BatchProcessor:
                 window_seconds=job_config.processing_config.window_seconds
             )
             context_manager = ContextManager(self.db_manager)
-            gpt5_client = GPT5Client(self.api_key)
+            gpt5_client = self._create_gpt5_client()
 
             # Update session status
             self.db_manager.update_session_status(session_id, SessionStatus.PROCESSING)
 
-            # Load and process windows
-            frame_descriptions, metadata = window_processor.load_frame_descriptions_from_json(file_path)
-            windows = window_processor.create_windows_from_frames(frame_descriptions)
+            # Stream windows straight into the analysis loop (JSONL inputs are never fully loaded)
+            windows = window_processor.iter_session_windows(file_path)
 
-            logger.info(f"Processing {len(windows)} windows for session {session_id}")
+            logger.info(f"Processing windows from {file_path} for session {session_id}")
+
+            # Job-constant values for the hot loop: backoff schedule (capped) and call arguments
+            max_retries = job_config.max_retries_per_window
+            retry_delays = tuple(min(MAX_RETRY_DELAY_SECONDS, 2.0 ** retry) for retry in range(max_retries))
+            analyze_window = gpt5_client.analyze_window_with_context
+            system_prompt = job_config.processing_config.system_prompt
+            gpt_config = job_config.gpt_config
 
             # Process each window
             completed_windows = 0
+            total_windows = 0
             for i, window in enumerate(windows, 1):
+                total_windows = i
                 window_id = f"{session_id}_window_{i}"
 
                 try:
+                    window_data = window.to_dict()
+
                     # Create window in database
                     self.db_manager.create_window(
                         window_id=window_id,
@@ -258,7 +348,7 @@ class BatchProcessor:
                         window_number=i,
                         start_time=window.start_time,
                         end_time=window.end_time,
-                        input_data=window.to_dict()
+                        input_data=window_data
                     )
 
                     # Build context
@@ -270,64 +360,68 @@ class BatchProcessor:
                     analysis_result = None
                     last_error = None
 
-                    for retry in range(job_config.max_retries_per_window + 1):
+                    for attempt, retry_delay in enumerate((*retry_delays, None), 1):
                         try:
-                            analysis_result = await gpt5_client.analyze_window_with_context(
-                                system_prompt=job_config.processing_config.system_prompt,
+                            analysis_result = await analyze_window(
+                                system_prompt=system_prompt,
                                 context_prompt=context_prompt,
-                                window_data=window.to_dict(),
-                                config=job_config.gpt_config
+                                window_data=window_data,
+                                config=gpt_config
                             )
                             break
                         except Exception as e:
                             last_error = e
-                            if retry < job_config.max_retries_per_window:
-                                logger.warning(f"Retry {retry + 1} for window {i} in session {session_id}: {e}")
-                                await asyncio.sleep(2 ** retry)  # Exponential backoff
+                            if retry_delay is not None:
+                                logger.warning(f"Retry {attempt} for window {i} in session {session_id}: {e}")
+                                await asyncio.sleep(retry_delay)  # Exponential backoff
                             else:
-                                logger.error(f"Failed to analyze window {i} after {job_config.max_retries_per_window} retries: {e}")
+                                logger.error(f"Failed to analyze window {i} after {max_retries} retries: {e}")
+
+                    # Persist the window outcome and session progress with a single commit
+                    with self.db_manager.transaction():
+                        if analysis_result:
+                            # Save successful result
+                            self.db_manager.update_window_status(
+                                window_id=window_id,
+                                status=WindowStatus.COMPLETED,
+                                output_data=analysis_result.to_dict(),
+                                processing_time=analysis_result.processing_time_seconds
+                            )
 
-                    if analysis_result:
-                        # Save successful result
-                        self.db_manager.update_window_status(
-                            window_id=window_id,
-                            status=WindowStatus.COMPLETED,
-                            output_data=analysis_result.to_dict(),
-                            processing_time=analysis_result.processing_time_seconds
-                        )
+                            # Save context and recommendations
+                            context_manager.save_window_context(
+                                session_id=session_id,
+                                window_number=i,
+                                window_context=window_processor.extract_window_context(window),
+                                analysis_result=analysis_result.content
+                            )
+                        else:
+                            # Save failed result
+                            self.db_manager.update_window_status(
+                                window_id=window_id,
+                                status=WindowStatus.FAILED,
+                                error_message=str(last_error) if last_error else "Unknown error"
+                            )
 
-                        # Save context and recommendations
-                        context_manager.save_window_context(
-                            session_id=session_id,
-                            window_number=i,
-                            window_context=window_processor.extract_window_context(window),
-                            analysis_result=analysis_result.content
+                        # Update session progress
+                        self.db_manager.update_session_status(
+                            session_id, SessionStatus.PROCESSING,
+                            completed_windows=completed_windows + (1 if analysis_result else 0)
                         )
 
+                    if analysis_result:
                         completed_windows += 1
-                    else:
-                        # Save failed result
-                        self.db_manager.update_window_status(
-                            window_id=window_id,
-                            status=WindowStatus.FAILED,
-                            error_message=str(last_error) if last_error else "Unknown error"
-                        )
-
-                    # Update session progress
-                    self.db_manager.update_session_status(
-                        session_id, SessionStatus.PROCESSING, completed_windows=completed_windows
-                    )
 
                 except Exception as e:
                     logger.error(f"Error processing window {i} in session {session_id}: {e}")
 
             # Mark session as completed
-            final_status = SessionStatus.COMPLETED if completed_windows == len(windows) else SessionStatus.FAILED
+            final_status = SessionStatus.COMPLETED if completed_windows == total_windows else SessionStatus.FAILED
             self.db_manager.update_session_status(
                 session_id, final_status, completed_windows=completed_windows
             )
 
-            logger.info(f"Session {session_id} completed: {completed_windows}/{len(windows)} windows processed")
+            logger.info(f"Session {session_id} completed: {completed_windows}/{total_windows} windows processed")
             return completed_windows > 0
 
         except Exception as e:
@@ -348,7 +442,7 @@ class BatchProcessor:
         batch_progress.overall_status = "cancelled"
 
         # Mark active sessions as paused
-        for session_id in batch_progress.active_sessions:
+        for session_id in batch_progress.get_active_sessions():
             self.db_manager.update_session_status(session_id, SessionStatus.PAUSED)
 
         logger.info(f"Cancelled batch job {job_id}")
@@ -373,45 +467,77 @@ class BatchProcessor:
             del self.active_jobs[job_id]
             logger.info(f"Cleaned up completed batch job: {job_id}")
 
+    def _parse_for_estimate(
+        self,
+        input_file: ValidatedFile,
+        window_processor: EnhancedWindowProcessor
+    ) -> Tuple[int, int, Optional[ProcessingWindow]]:
+        """Parse a file once for estimation, reusing earlier results for unchanged files."""
+        cache_key = (input_file.path, input_file.size, input_file.mtime, window_processor.window_seconds)
+        cached = self._parse_cache.get(cache_key)
+        if cached is None:
+            frame_descriptions, _ = window_processor.load_frame_descriptions_from_json(input_file.path)
+            windows = window_processor.create_windows_from_frames(frame_descriptions)
+            cached = (len(frame_descriptions), len(windows), windows[0] if windows else None)
+            self._parse_cache[cache_key] = cached
+        return cached
+
     async def estimate_batch_processing_time(
         self,
         input_files: List[str],
         processing_config: ProcessingConfig,
         gpt_config: GPTConfig
     ) -> Dict[str, Any]:
-        """Estimate the processing time and cost for a batch job."""
+        """
+        Estimate the processing time and cost for a batch job.
 
-        total_windows = 0
-        total_frames = 0
-        estimated_tokens = 0
+        Only up to ESTIMATE_SAMPLE_FILES files are parsed; their per-byte window, frame
+        and token rates are extrapolated to the total size of all input files.
+        """
 
         window_processor = EnhancedWindowProcessor(processing_config.window_seconds)
-        gpt5_client = GPT5Client(self.api_key)
-
-        for file_path in input_files:
-            if not os.path.exists(file_path):
+        gpt5_client = self._create_gpt5_client()
+        context_manager = ContextManager(self.db_manager)
+        existing_files = self._resolve_input_files(input_files)
+        sampled_files = self._estimate_sample(existing_files)
+
+        sampled_bytes = 0
+        sampled_windows = 0
+        sampled_frames = 0
+        sampled_input_tokens = 0
+        sampled_output_tokens = 0
+
+        for input_file in sampled_files:
+            try:
+                frame_count, window_count, first_window = self._parse_for_estimate(input_file, window_processor)
+            except Exception as e:
+                logger.warning(f"Could not estimate for {input_file.path}: {e}")
                 continue
 
-            try:
-                frame_descriptions, metadata = window_processor.load_frame_descriptions_from_json(file_path)
-                windows = window_processor.create_windows_from_frames(frame_descriptions)
-
-                total_windows += len(windows)
-                total_frames += len(frame_descriptions)
-
-                # Estimate tokens for first window (as sample)
-                if windows:
-                    context_manager = ContextManager(self.db_manager)
-                    context_prompt = context_manager.build_context_for_window("sample", 1, windows[0])
-                    token_estimate = gpt5_client.estimate_token_usage(
-                        processing_config.system_prompt,
-                        context_prompt,
-                        windows[0].to_dict()
-                    )
-                    estimated_tokens += token_estimate['estimated_total_tokens'] * len(windows)
+            sampled_bytes += input_file.size
+            sampled_frames += frame_count
+            sampled_windows += window_count
+
+            # Estimate tokens for first window (as sample)
+            if first_window is not None:
+                context_prompt = context_manager.build_context_for_window("sample", 1, first_window)
+                token_estimate = gpt5_client.estimate_token_usage(
+                    processing_config.system_prompt,
+                    context_prompt,
+                    first_window.to_dict()
+                )
+                sampled_input_tokens += token_estimate['estimated_input_tokens'] * window_count
+                sampled_output_tokens += token_estimate['estimated_output_tokens'] * window_count
 
-            except Exception as e:
-                logger.warning(f"Could not estimate for {file_path}: {e}")
+        # Extrapolate the sampled per-byte rates to every input file
+        total_bytes = sum(input_file.size for input_file in existing_files)
+        scale = total_bytes / sampled_bytes if sampled_bytes else 0.0
+
+        total_windows = round(sampled_windows * scale)
+        total_frames = round(sampled_frames * scale)
+        estimated_input_tokens = round(sampled_input_tokens * scale)
+        estimated_output_tokens = round(sampled_output_tokens * scale)
+        estimated_tokens = estimated_input_tokens + estimated_output_tokens
 
         # Estimate processing time (rough approximation)
         avg_processing_time_per_window = 30  # seconds
@@ -419,15 +545,19 @@ class BatchProcessor:
 
         # Estimate cost
         estimated_cost = gpt5_client.calculate_estimated_cost(
-            {'estimated_total_tokens': estimated_tokens},
+            {
+                'estimated_input_tokens': estimated_input_tokens,
+                'estimated_output_tokens': estimated_output_tokens
+            },
             gpt_config.model
         )
 
         return {
-            'total_sessions': len([f for f in input_files if os.path.exists(f)]),
+            'total_sessions': len(existing_files),
+            'sampled_sessions': len(sampled_files),
             'total_windows': total_windows,
             'total_frames': total_frames,
             'estimated_processing_time_minutes': estimated_total_time_seconds / 60,
             'estimated_tokens': estimated_tokens,
             'estimated_cost_usd': estimated_cost
-        }
\ No newline at end of file
+        }
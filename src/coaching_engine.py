@@ -3,24 +3,61 @@ Coaching Engine - Main orchestration for AI performance coaching analysis.
 Coordinates frame processing, window analysis, and recommendation generation.
 """
 
+import asyncio
 import json
+import orjson
 import time
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Callable
-from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Any, Union, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from operator import attrgetter, itemgetter
 
 from .config import Config
-from .utils import setup_logging, safe_json_stringify, create_output_filename, ensure_output_dir
+from .utils import DATACLASS_OPTIONS, setup_logging, create_output_filename, ensure_output_dir
 from .frame_processor import FrameProcessor, Window
 from .prompt_manager import PromptManager
 from .window_manager import WindowManager
 from .api_client import APIClient
+from .response_cache import ResponseCache, default_response_cache, fingerprint
 
 logger = setup_logging(__name__)
 
-@dataclass
+# Seconds between status checks while an OpenAI Batch API job runs
+BATCH_POLL_INTERVAL_SECONDS = 60
+BATCH_TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+@contextmanager
+def _private_loop_runner() -> Iterator[Callable[[Any], Any]]:
+    """
+    Yield a function that runs an awaitable to completion on a private event loop.
+
+    From synchronous code the loop runs in the calling thread. When called from inside a
+    running event loop, where run_until_complete would raise, it runs on a worker thread.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        worker = None
+        run = loop.run_until_complete
+    else:
+        worker = ThreadPoolExecutor(max_workers=1)
+
+        def run(awaitable: Any) -> Any:
+            return worker.submit(loop.run_until_complete, awaitable).result()
+
+    try:
+        yield run
+    finally:
+        if worker is not None:
+            worker.shutdown(wait=True)
+        loop.close()
+
+@dataclass(**DATACLASS_OPTIONS)
 class RecommendationResult:
     """Result from a single window analysis."""
     window_index: int
@@ -36,8 +73,9 @@ class RecommendationResult:
     tool_calls: int
     timestamp: datetime
     raw_response: Optional[Dict[str, Any]] = None
+    has_error: bool = False
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class AnalysisSession:
     """Complete analysis session results."""
     session_id: str
@@ -50,6 +88,24 @@ class AnalysisSession:
     timestamp: datetime
     frame_count: int
     video_duration: float
+    # Digest of the model settings, interval and prompts; a resumed run must match it
+    settings_fingerprint: str = ''
+    raw_responses_retained: bool = False
+
+# Reads every exported RecommendationResult field in one call
+_EXPORT_FIELDS = attrgetter(
+    'window_index', 'window_start_time', 'window_end_time', 'recommendation', 'previous_context',
+    'confidence', 'processing_time', 'model_used', 'tokens_used', 'search_results', 'tool_calls',
+    'timestamp', 'has_error', 'raw_response'
+)
+
+# Columns of a CSV export, in order (raw API responses are too complex for CSV)
+CSV_FIELDNAMES = (
+    'window_index', 'window_time_range', 'recommendation', 'previous_context', 'confidence',
+    'processing_time_ms', 'model_used', 'tokens_used', 'search_results_count', 'tool_calls',
+    'timestamp', 'has_error'
+)
+_CSV_ROW_VALUES = itemgetter(*CSV_FIELDNAMES)
 
 class CoachingEngine:
     """Main coaching analysis engine."""
@@ -57,7 +113,8 @@ class CoachingEngine:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        progress_callback: Optional[Callable[[str, float], None]] = None
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+        response_cache_dir: Optional[Union[str, Path]] = None
     ):
         """
         Initialize coaching engine.
@@ -65,6 +122,7 @@ class CoachingEngine:
         Args:
             api_key: Optional OpenAI API key override
             progress_callback: Optional callback for progress updates (message, progress_0_to_1)
+            response_cache_dir: Optional directory for the response cache (defaults under OUTPUT_DIR)
         """
         self.logger = logger
         self.progress_callback = progress_callback
@@ -74,9 +132,12 @@ class CoachingEngine:
         self.prompt_manager = PromptManager()
         self.window_manager = WindowManager()
         self.api_client = APIClient(api_key)
+        self.response_cache = default_response_cache(response_cache_dir)
 
         # Session state
         self.current_session: Optional[AnalysisSession] = None
+        self._retain_raw_responses = False
+        self._start_session_clock()
 
     def analyze_frames(
         self,
@@ -84,7 +145,9 @@ class CoachingEngine:
         interval_minutes: float = None,
         template_type: str = None,
         custom_prompts: Optional[Dict[str, str]] = None,
-        api_settings: Optional[Dict[str, Any]] = None
+        api_settings: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        retain_raw_responses: bool = False
     ) -> AnalysisSession:
         """
         Analyze frame descriptions and generate coaching recommendations.
@@ -95,21 +158,63 @@ class CoachingEngine:
             template_type: Prompt template to use
             custom_prompts: Custom system/user prompts
             api_settings: API configuration overrides
+            session_id: Interrupted session to resume from its checkpoint
+            retain_raw_responses: Keep full API responses on each result for export
 
         Returns:
             AnalysisSession with complete results
         """
-        session_start = time.time()
-        session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        results = self.analyze_frames_stream(
+            frame_data, interval_minutes, template_type, custom_prompts, api_settings, session_id,
+            retain_raw_responses
+        )
+        for _ in results:
+            pass
+
+        return self.current_session
+
+    def analyze_frames_stream(
+        self,
+        frame_data: Union[str, Dict, Path],
+        interval_minutes: float = None,
+        template_type: str = None,
+        custom_prompts: Optional[Dict[str, str]] = None,
+        api_settings: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        retain_raw_responses: bool = False
+    ) -> Iterator[RecommendationResult]:
+        """
+        Analyze frame descriptions, yielding each window's recommendation as soon as it is ready.
+
+        Results are yielded in window order. Once the generator is exhausted, the complete
+        AnalysisSession is available as current_session. Every result is appended to
+        sessions/<session_id>.partial.jsonl as it arrives; passing the session_id of an
+        interrupted run reuses its successful windows and only analyzes the rest.
+
+        Args:
+            frame_data: Frame descriptions (JSON string, dict, or file path)
+            interval_minutes: Chunking interval in minutes
+            template_type: Prompt template to use
+            custom_prompts: Custom system/user prompts
+            api_settings: API configuration overrides
+            session_id: Interrupted session to resume from its checkpoint
+            retain_raw_responses: Keep full API responses on each result for export
+
+        Yields:
+            RecommendationResult for each window
+        """
+        self._start_session_clock()
+        self._retain_raw_responses = retain_raw_responses
+        session_id = session_id or f"session_{self._session_start_wall.strftime('%Y%m%d_%H%M%S')}"
+        checkpoint_path = ensure_output_dir("sessions") / f"{session_id}.partial.jsonl"
 
         try:
             self.logger.info(f"Starting coaching analysis session: {session_id}")
             self._update_progress("Initializing analysis session...", 0.0)
 
-            # Load and validate frame data
+            # Load frame data as raw bytes; the parser decodes and validates UTF-8 itself
             if isinstance(frame_data, Path):
-                with open(frame_data, 'r', encoding='utf-8') as f:
-                    frame_data = f.read()
+                frame_data = frame_data.read_bytes()
 
             # Set up prompts
             self._setup_prompts(template_type, custom_prompts)
@@ -125,35 +230,61 @@ class CoachingEngine:
 
             self.logger.info(f"Created {len(windows)} windows from {len(frames)} frames")
 
+            # Reuse windows finished by an interrupted run of this session with the same settings
+            settings_fingerprint = self._settings_fingerprint(api_settings, interval)
+            completed = self._load_checkpoint(checkpoint_path, settings_fingerprint)
+            if completed:
+                self.logger.info(f"Resuming session {session_id}: {len(completed)} windows already complete")
+
             # Process windows
             self._update_progress("Generating recommendations...", 0.3)
-            recommendations = self._process_windows(windows, api_settings)
+            if api_settings and api_settings.get('batch', False):
+                batch_settings = {key: value for key, value in api_settings.items() if key != 'batch'}
+                with _private_loop_runner() as run:
+                    window_results = iter(run(self._process_windows_batch(windows, batch_settings, completed)))
+            else:
+                window_results = self._iter_window_results(windows, api_settings, completed)
+
+            recommendations = []
+            with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+                if checkpoint.tell() == 0:
+                    checkpoint.write(json.dumps({'settings_fingerprint': settings_fingerprint}) + '\n')
+
+                for result in window_results:
+                    recommendations.append(result)
+                    if result.window_index not in completed:
+                        self._write_checkpoint(checkpoint, result)
+                    yield result
 
             # Create session results
-            total_time = int((time.time() - session_start) * 1000)
+            total_time = (time.monotonic_ns() - self._session_start_mono) // 1_000_000
             video_duration = windows[-1].end_time - windows[0].start_time if windows else 0
 
+            failed_windows = sum(r.has_error for r in recommendations)
+
             session = AnalysisSession(
                 session_id=session_id,
                 total_windows=len(windows),
-                successful_windows=len([r for r in recommendations if not r.recommendation.startswith('ERROR:')]),
-                failed_windows=len([r for r in recommendations if r.recommendation.startswith('ERROR:')]),
+                successful_windows=len(recommendations) - failed_windows,
+                failed_windows=failed_windows,
                 total_processing_time=total_time,
                 recommendations=recommendations,
                 settings_used=self._get_session_settings(api_settings),
-                timestamp=datetime.now(),
+                timestamp=self._session_clock(),
                 frame_count=len(frames),
-                video_duration=video_duration
+                video_duration=video_duration,
+                settings_fingerprint=settings_fingerprint,
+                raw_responses_retained=retain_raw_responses
             )
 
             self.current_session = session
+            checkpoint_path.replace(checkpoint_path.with_name(f"{session_id}.jsonl"))
             self._update_progress("Analysis complete!", 1.0)
 
             self.logger.info(f"Session {session_id} completed: {session.successful_windows}/{session.total_windows} successful")
-            return session
 
         except Exception as error:
-            self.logger.error(f"Analysis session failed: {error}")
+            self.logger.error(f"Analysis session {session_id} failed (resumable from checkpoint): {error}")
             self._update_progress(f"Analysis failed: {error}", 0.0)
             raise error
 
@@ -180,77 +311,364 @@ class CoachingEngine:
     ) -> List[RecommendationResult]:
         """Process all windows and generate recommendations."""
 
-        recommendations = []
-        previous_context = ""
+        return list(self._iter_window_results(windows, api_settings))
 
-        for i, window in enumerate(windows):
+    def _iter_window_results(
+        self,
+        windows: List[Window],
+        api_settings: Optional[Dict[str, Any]],
+        completed: Optional[Dict[int, RecommendationResult]] = None
+    ) -> Iterator[RecommendationResult]:
+        """Drive _iter_windows_async on a private event loop, yielding each result to sync callers."""
+
+        results = self._iter_windows_async(windows, api_settings, completed or {})
+
+        with _private_loop_runner() as run:
             try:
-                progress = 0.3 + (i / len(windows)) * 0.6  # 30% to 90%
-                self._update_progress(f"Processing window {i + 1}/{len(windows)}...", progress)
+                while True:
+                    try:
+                        yield run(results.__anext__())
+                    except StopAsyncIteration:
+                        break
+            finally:
+                run(results.aclose())
+
+    async def _iter_windows_async(
+        self,
+        windows: List[Window],
+        api_settings: Optional[Dict[str, Any]],
+        completed: Dict[int, RecommendationResult]
+    ) -> AsyncIterator[RecommendationResult]:
+        """
+        Generate recommendations for all windows, yielding them in window order.
+
+        With Config.MAX_CONCURRENCY of 1, windows run in order and each prompt carries the
+        previous window's recommendation. Above 1, up to that many API calls are in flight
+        at once and each prompt carries only the previous window's activity summary; every
+        window gets a one-slot queue so results are yielded the moment the next one is ready.
+        Windows present in completed are yielded as-is without calling the API.
+        Prompts are read once up front; changing them mid-session is not supported.
+        """
 
-                # Build context prompt
-                context_prompt = self.window_manager.build_context_prompt(window, previous_context)
+        concurrency = max(1, Config.MAX_CONCURRENCY)
+        total = len(windows)
+        system_prompt = self.prompt_manager.get_system_prompt()
+        user_prompt = self.prompt_manager.get_user_prompt()
 
-                # Generate recommendation
-                system_prompt = self.prompt_manager.get_system_prompt()
-                user_prompt = self.prompt_manager.get_user_prompt()
+        if concurrency == 1:
+            previous_context = ""
 
-                api_response = self.api_client.generate_recommendation(
-                    system_prompt=system_prompt,
-                    user_prompt=user_prompt,
-                    frame_context=context_prompt,
-                    settings=api_settings
+            for i, window in enumerate(windows):
+                progress = 0.3 + (i / total) * 0.6  # 30% to 90%
+                self._update_progress(f"Processing window {i + 1}/{total}...", progress)
+
+                if i in completed:
+                    result = completed[i]
+                    yield result
+                    previous_context = self.window_manager.summarize_window(window, result.recommendation)
+                    continue
+
+                result = await self._analyze_window(
+                    i, window, previous_context, system_prompt, user_prompt, api_settings
                 )
+                yield result
+
+                if not result.has_error:
+                    # Update context for next window
+                    previous_context = self.window_manager.summarize_window(window, result.recommendation)
 
-                # Create result
-                result = RecommendationResult(
-                    window_index=i,
-                    window_start_time=window.start_time,
-                    window_end_time=window.end_time,
-                    recommendation=api_response['content'],
-                    previous_context=previous_context,
-                    confidence=api_response.get('confidence', 0.8),
-                    processing_time=api_response.get('processing_time', 0),
-                    model_used=api_response.get('model', 'gpt-5'),
-                    tokens_used=api_response.get('tokens_used', 0),
-                    search_results=api_response.get('search_results', []),
-                    tool_calls=api_response.get('tool_calls', 0),
-                    timestamp=datetime.now(),
-                    raw_response=api_response.get('raw_response')
+            return
+
+        semaphore = asyncio.Semaphore(concurrency)
+        results: List[asyncio.Queue] = [asyncio.Queue(1) for _ in windows]
+
+        async def run_one(i: int, window: Window) -> None:
+            previous_context = self.window_manager.summarize_window(windows[i - 1]) if i > 0 else ""
+            async with semaphore:
+                result = await self._analyze_window(
+                    i, window, previous_context, system_prompt, user_prompt, api_settings
                 )
+            await results[i].put(result)
+
+        tasks = []
+        for i, window in enumerate(windows):
+            if i in completed:
+                results[i].put_nowait(completed[i])
+            else:
+                tasks.append(asyncio.ensure_future(run_one(i, window)))
+        try:
+            for i in range(total):
+                result = await results[i].get()
+                progress = 0.3 + ((i + 1) / total) * 0.6  # 30% to 90%
+                self._update_progress(f"Processed window {i + 1}/{total}...", progress)
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _analyze_window(
+        self,
+        i: int,
+        window: Window,
+        previous_context: str,
+        system_prompt: str,
+        user_prompt: str,
+        api_settings: Optional[Dict[str, Any]]
+    ) -> RecommendationResult:
+        """Generate the recommendation for one window, mapping failures to an error result."""
 
-                recommendations.append(result)
+        try:
+            # Build context prompt
+            context_prompt = self.window_manager.build_context_prompt(window, previous_context)
+
+            # Generate recommendation (the API client is synchronous, so run it off the event loop)
+            api_response = await asyncio.to_thread(
+                self._generate_recommendation,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                frame_context=context_prompt,
+                settings=api_settings
+            )
 
-                # Update context for next window
-                previous_context = self.window_manager.summarize_window(window, api_response['content'])
+            # Create result
+            return RecommendationResult(
+                window_index=i,
+                window_start_time=window.start_time,
+                window_end_time=window.end_time,
+                recommendation=api_response['content'],
+                previous_context=previous_context,
+                confidence=api_response.get('confidence', 0.8),
+                processing_time=api_response.get('processing_time', 0),
+                model_used=api_response.get('model', 'gpt-5'),
+                tokens_used=api_response.get('tokens_used', 0),
+                search_results=api_response.get('search_results', []),
+                tool_calls=api_response.get('tool_calls', 0),
+                timestamp=self._session_clock(),
+                raw_response=api_response.get('raw_response') if self._retain_raw_responses else None,
+                has_error=False
+            )
 
-                # Brief pause to avoid rate limits
-                if i < len(windows) - 1:
-                    time.sleep(0.5)
+        except Exception as error:
+            self.logger.error(f"Window {i} processing failed: {error}")
+            return self._error_result(i, window, previous_context, error)
 
-            except Exception as error:
-                self.logger.error(f"Window {i} processing failed: {error}")
+    def _settings_fingerprint(self, api_settings: Optional[Dict[str, Any]], interval: float) -> str:
+        """Digest everything that shapes a session's recommendations."""
 
-                # Create error result
-                error_result = RecommendationResult(
-                    window_index=i,
-                    window_start_time=window.start_time,
-                    window_end_time=window.end_time,
-                    recommendation=f"ERROR: {str(error)}",
-                    previous_context=previous_context,
-                    confidence=0.0,
-                    processing_time=0,
-                    model_used="error",
-                    tokens_used=0,
-                    search_results=[],
-                    tool_calls=0,
-                    timestamp=datetime.now()
-                )
+        resolved = Config.get_api_settings()
+        if api_settings:
+            resolved.update(api_settings)
+        resolved.pop('batch', None)
+
+        return fingerprint(
+            *sorted(resolved.items()), interval,
+            self.prompt_manager.get_system_prompt(), self.prompt_manager.get_user_prompt()
+        )
+
+    def _load_checkpoint(self, checkpoint_path: Path, settings_fingerprint: str) -> Dict[int, RecommendationResult]:
+        """Load the successful results recorded by an interrupted run, keyed by window index."""
+
+        completed = {}
+        if not checkpoint_path.exists():
+            return completed
+
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                    if 'settings_fingerprint' in data:
+                        if data['settings_fingerprint'] != settings_fingerprint:
+                            break
+                        continue
+
+                    data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+                    result = RecommendationResult(**data)
+                except (ValueError, TypeError, KeyError) as error:
+                    # A run killed mid-write leaves a truncated last line
+                    self.logger.warning(f"Skipping unreadable checkpoint line: {error}")
+                    continue
+
+                if not result.has_error:
+                    completed[result.window_index] = result
+            else:
+                return completed
+
+        # Results produced under other settings cannot be mixed into this run
+        stale_path = checkpoint_path.with_suffix('.stale')
+        self.logger.warning(f"Checkpoint settings changed; starting over and keeping the old checkpoint at {stale_path}")
+        checkpoint_path.replace(stale_path)
+        return {}
+
+    def _write_checkpoint(self, checkpoint, result: RecommendationResult) -> None:
+        """Append one result to the session checkpoint and flush it to disk."""
 
-                recommendations.append(error_result)
+        data = asdict(result)
+        data['timestamp'] = result.timestamp.isoformat()
+        checkpoint.write(json.dumps(data, default=str) + '\n')
+        checkpoint.flush()
+
+    def _generate_recommendation(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        frame_context: str,
+        settings: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Generate a recommendation, serving repeat requests from the response cache."""
+
+        if not self.response_cache:
+            return self.api_client.generate_recommendation(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                frame_context=frame_context,
+                settings=settings
+            )
+
+        resolved = Config.get_api_settings()
+        if settings:
+            resolved.update(settings)
+
+        key = ResponseCache.make_key(
+            resolved.get('model_name'), resolved.get('reasoning_effort'), resolved.get('verbosity'),
+            resolved.get('max_tokens'), system_prompt, user_prompt, frame_context
+        )
+
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            self.logger.info("Using cached response for identical request")
+            return cached
+
+        api_response = self.api_client.generate_recommendation(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            frame_context=frame_context,
+            settings=settings
+        )
+        # The raw SDK response is only kept when a session opts in, so it is never cached
+        self.response_cache.put(key, {k: v for k, v in api_response.items() if k != 'raw_response'})
+        return api_response
+
+    def _error_result(
+        self,
+        i: int,
+        window: Window,
+        previous_context: str,
+        error: Union[Exception, str]
+    ) -> RecommendationResult:
+        """Create the result recorded for a window whose analysis failed."""
+
+        return RecommendationResult(
+            window_index=i,
+            window_start_time=window.start_time,
+            window_end_time=window.end_time,
+            recommendation=f"ERROR: {str(error)}",
+            previous_context=previous_context,
+            confidence=0.0,
+            processing_time=0,
+            model_used="error",
+            tokens_used=0,
+            search_results=[],
+            tool_calls=0,
+            timestamp=self._session_clock(),
+            has_error=True
+        )
+
+    async def _process_windows_batch(
+        self,
+        windows: List[Window],
+        api_settings: Optional[Dict[str, Any]],
+        completed: Optional[Dict[int, RecommendationResult]] = None
+    ) -> List[RecommendationResult]:
+        """
+        Generate recommendations for all windows through the OpenAI Batch API.
+
+        Batch requests are priced lower than realtime calls but may take up to 24 hours,
+        so this suits offline analyses. All windows are submitted at once, so each prompt
+        carries the previous window's activity summary rather than its recommendation.
+        Windows present in completed are returned as-is and not submitted.
+        """
+
+        completed = completed or {}
+        pending = [i for i in range(len(windows)) if i not in completed]
+        if not pending:
+            return [completed[i] for i in range(len(windows))]
+
+        start_time = time.time()
+        system_prompt = self.prompt_manager.get_system_prompt()
+        user_prompt = self.prompt_manager.get_user_prompt()
+
+        previous_contexts = [""] + [self.window_manager.summarize_window(window) for window in windows[:-1]]
+        requests = [
+            self.api_client.build_batch_request(
+                custom_id=f"win-{i}",
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                frame_context=self.window_manager.build_context_prompt(window, previous_contexts[i]),
+                settings=api_settings
+            )
+            for i, window in enumerate(windows)
+            if i not in completed
+        ]
+
+        batch = await asyncio.to_thread(self.api_client.submit_batch, requests)
+        while batch['status'] not in BATCH_TERMINAL_STATUSES:
+            counts = batch.get('request_counts') or {}
+            done = counts.get('completed', 0) + counts.get('failed', 0)
+            progress = 0.3 + (done / len(pending)) * 0.6  # 30% to 90%
+            self._update_progress(f"Batch {batch['id']} {batch['status']}: {done}/{len(pending)} windows...", progress)
+
+            await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+            batch = await asyncio.to_thread(self.api_client.retrieve_batch, batch['id'])
+
+        if batch['status'] != 'completed' and not batch.get('output_file_id'):
+            raise RuntimeError(f"Batch {batch['id']} ended with status '{batch['status']}'")
+
+        responses = await asyncio.to_thread(self.api_client.read_batch_results, batch, api_settings, start_time)
+
+        recommendations = []
+        for i, window in enumerate(windows):
+            if i in completed:
+                recommendations.append(completed[i])
+                continue
+
+            api_response = responses.get(f"win-{i}")
+            if api_response is None or 'error' in api_response:
+                error = api_response['error'] if api_response else f"No batch output (status: {batch['status']})"
+                self.logger.error(f"Window {i} processing failed: {error}")
+                recommendations.append(self._error_result(i, window, previous_contexts[i], error))
+                continue
+
+            recommendations.append(RecommendationResult(
+                window_index=i,
+                window_start_time=window.start_time,
+                window_end_time=window.end_time,
+                recommendation=api_response['content'],
+                previous_context=previous_contexts[i],
+                confidence=api_response.get('confidence', 0.8),
+                processing_time=api_response.get('processing_time', 0),
+                model_used=api_response.get('model', 'gpt-5'),
+                tokens_used=api_response.get('tokens_used', 0),
+                search_results=api_response.get('search_results', []),
+                tool_calls=api_response.get('tool_calls', 0),
+                timestamp=self._session_clock(),
+                raw_response=api_response.get('raw_response') if self._retain_raw_responses else None,
+                has_error=False
+            ))
 
         return recommendations
 
+    def _start_session_clock(self) -> None:
+        """Anchor the session clock: one wall-clock read, then monotonic offsets from it."""
+
+        self._session_start_wall = datetime.now()
+        self._session_start_mono = time.monotonic_ns()
+
+    def _session_clock(self) -> datetime:
+        """Current time derived from the session anchor, immune to wall-clock jumps mid-session."""
+
+        return self._session_start_wall + timedelta(microseconds=(time.monotonic_ns() - self._session_start_mono) // 1000)
+
     def _get_session_settings(self, api_settings: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Get settings used for this session."""
 
@@ -288,12 +706,15 @@ class CoachingEngine:
         if not session:
             raise ValueError("No session to export")
 
+        if include_raw_responses and not session.raw_responses_retained:
+            self.logger.warning(
+                f"Session {session.session_id} was analyzed without retain_raw_responses; "
+                "raw API responses are not available for export"
+            )
+
         try:
             self.logger.info(f"Exporting session {session.session_id} as {output_format}")
 
-            # Prepare export data
-            export_data = self._prepare_export_data(session, include_raw_responses)
-
             # Create output filename
             filename = create_output_filename(
                 prefix=f"coaching_analysis_{session.session_id}",
@@ -305,9 +726,9 @@ class CoachingEngine:
 
             # Export based on format
             if output_format.lower() == 'json':
-                self._export_json(export_data, output_path)
+                self._export_json(session, include_raw_responses, output_path)
             elif output_format.lower() == 'csv':
-                self._export_csv(export_data, output_path)
+                self._export_csv(session, output_path)
             else:
                 raise ValueError(f"Unsupported export format: {output_format}")
 
@@ -318,84 +739,86 @@ class CoachingEngine:
             self.logger.error(f"Export failed: {error}")
             raise error
 
-    def _prepare_export_data(
+    def _session_metadata(self, session: AnalysisSession) -> Dict[str, Any]:
+        """Session-level fields written at the head of every export."""
+
+        return {
+            'session_id': session.session_id,
+            'timestamp': session.timestamp.isoformat(),
+            'total_windows': session.total_windows,
+            'successful_windows': session.successful_windows,
+            'failed_windows': session.failed_windows,
+            'total_processing_time_ms': session.total_processing_time,
+            'frame_count': session.frame_count,
+            'video_duration_seconds': session.video_duration,
+            'success_rate': session.successful_windows / session.total_windows if session.total_windows > 0 else 0
+        }
+
+    def _iter_recommendation_rows(
         self,
         session: AnalysisSession,
         include_raw_responses: bool
-    ) -> Dict[str, Any]:
-        """Prepare session data for export."""
+    ) -> Iterator[Dict[str, Any]]:
+        """Convert recommendations to export dicts one at a time."""
 
-        # Convert recommendations to dict format
-        recommendations_data = []
-        for rec in session.recommendations:
+        for (window_index, start, end, recommendation, previous_context, confidence, processing_time,
+             model_used, tokens_used, search_results, tool_calls, timestamp, has_error,
+             raw_response) in map(_EXPORT_FIELDS, session.recommendations):
             rec_data = {
-                'window_index': rec.window_index + 1,
-                'window_time_range': f"{rec.window_start_time:.1f}s - {rec.window_end_time:.1f}s",
-                'recommendation': rec.recommendation,
-                'previous_context': rec.previous_context,
-                'confidence': rec.confidence,
-                'processing_time_ms': rec.processing_time,
-                'model_used': rec.model_used,
-                'tokens_used': rec.tokens_used,
-                'search_results_count': len(rec.search_results),
-                'tool_calls': rec.tool_calls,
-                'timestamp': rec.timestamp.isoformat(),
-                'has_error': rec.recommendation.startswith('ERROR:')
+                'window_index': window_index + 1,
+                'window_time_range': f"{start:.1f}s - {end:.1f}s",
+                'recommendation': recommendation,
+                'previous_context': previous_context,
+                'confidence': confidence,
+                'processing_time_ms': processing_time,
+                'model_used': model_used,
+                'tokens_used': tokens_used,
+                'search_results_count': len(search_results),
+                'tool_calls': tool_calls,
+                'timestamp': timestamp.isoformat(),
+                'has_error': has_error
             }
 
-            if include_raw_responses and rec.raw_response:
-                rec_data['raw_api_response'] = rec.raw_response
+            if include_raw_responses and raw_response:
+                rec_data['raw_api_response'] = raw_response
 
-            recommendations_data.append(rec_data)
+            yield rec_data
 
-        return {
-            'session_metadata': {
-                'session_id': session.session_id,
-                'timestamp': session.timestamp.isoformat(),
-                'total_windows': session.total_windows,
-                'successful_windows': session.successful_windows,
-                'failed_windows': session.failed_windows,
-                'total_processing_time_ms': session.total_processing_time,
-                'frame_count': session.frame_count,
-                'video_duration_seconds': session.video_duration,
-                'success_rate': session.successful_windows / session.total_windows if session.total_windows > 0 else 0
-            },
-            'settings_used': session.settings_used,
-            'recommendations': recommendations_data
-        }
+    def _export_json(self, session: AnalysisSession, include_raw_responses: bool, output_path: Path) -> None:
+        """Export session as JSON, serializing one recommendation at a time."""
+
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
 
-    def _export_json(self, data: Dict[str, Any], output_path: Path) -> None:
-        """Export data as JSON."""
+        def dumps(value: Any, depth: int) -> bytes:
+            # Re-indent nested values so the streamed file matches a single indented dump
+            return orjson.dumps(value, default=str, option=options).replace(b'\n', b'\n' + b'  ' * depth)
 
-        success, json_str, error = safe_json_stringify(data, pretty=True)
-        if not success:
-            raise ValueError(f"JSON serialization failed: {error}")
+        with open(output_path, 'wb') as f:
+            f.write(b'{\n  "session_metadata": ' + dumps(self._session_metadata(session), 1))
+            f.write(b',\n  "settings_used": ' + dumps(session.settings_used, 1))
+            f.write(b',\n  "recommendations": [')
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(json_str)
+            separator = b'\n    '
+            for rec_data in self._iter_recommendation_rows(session, include_raw_responses):
+                f.write(separator + dumps(rec_data, 2))
+                separator = b',\n    '
 
-    def _export_csv(self, data: Dict[str, Any], output_path: Path) -> None:
-        """Export recommendations as CSV."""
+            f.write(b'\n  ]\n}' if separator != b'\n    ' else b']\n}')
+
+    def _export_csv(self, session: AnalysisSession, output_path: Path) -> None:
+        """Export recommendations as CSV, writing each row as it is built."""
 
         import csv
 
-        recommendations = data['recommendations']
-        if not recommendations:
+        if not session.recommendations:
             raise ValueError("No recommendations to export")
 
-        # Get fieldnames from first recommendation
-        fieldnames = list(recommendations[0].keys())
-        if 'raw_api_response' in fieldnames:
-            fieldnames.remove('raw_api_response')  # Too complex for CSV
-
         with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDNAMES)
 
-            for rec in recommendations:
-                # Create CSV-safe version
-                csv_rec = {k: v for k, v in rec.items() if k in fieldnames}
-                writer.writerow(csv_rec)
+            for rec in self._iter_recommendation_rows(session, include_raw_responses=False):
+                writer.writerow(_CSV_ROW_VALUES(rec))
 
     def get_session_summary(self, session: Optional[AnalysisSession] = None) -> Dict[str, Any]:
         """Get summary statistics for a session."""
@@ -404,7 +827,20 @@ class CoachingEngine:
         if not session:
             return {'error': 'No session available'}
 
-        successful_recs = [r for r in session.recommendations if not r.recommendation.startswith('ERROR:')]
+        # Accumulate every statistic over successful windows in a single pass
+        successful = 0
+        total_processing_time = 0
+        total_tokens = 0
+        total_searches = 0
+        models = set()
+        for r in session.recommendations:
+            if r.has_error:
+                continue
+            successful += 1
+            total_processing_time += r.processing_time
+            total_tokens += r.tokens_used
+            total_searches += len(r.search_results)
+            models.add(r.model_used)
 
         return {
             'session_id': session.session_id,
@@ -412,12 +848,12 @@ class CoachingEngine:
             'windows_processed': session.total_windows,
             'success_rate': f"{session.successful_windows}/{session.total_windows} ({session.successful_windows/session.total_windows*100:.1f}%)",
             'total_processing_time': f"{session.total_processing_time/1000:.1f}s",
-            'average_processing_time': f"{sum(r.processing_time for r in successful_recs)/len(successful_recs):.0f}ms" if successful_recs else "N/A",
-            'total_tokens_used': sum(r.tokens_used for r in successful_recs),
-            'total_search_queries': sum(len(r.search_results) for r in successful_recs),
+            'average_processing_time': f"{total_processing_time/successful:.0f}ms" if successful else "N/A",
+            'total_tokens_used': total_tokens,
+            'total_search_queries': total_searches,
             'video_duration': f"{session.video_duration:.1f}s ({session.video_duration/60:.1f}m)",
             'frames_analyzed': session.frame_count,
-            'models_used': list(set(r.model_used for r in successful_recs))
+            'models_used': list(models)
         }
 
     def test_configuration(self) -> Dict[str, Any]:
@@ -426,39 +862,15 @@ class CoachingEngine:
         try:
             self.logger.info("Testing coaching engine configuration")
 
-            # Test API connection
-            api_test = self.api_client.test_connection()
+            # The API ping dominates; run the local checks alongside it
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                api_future = executor.submit(self.api_client.test_connection)
+                frame_future = executor.submit(self._test_frame_processing)
+                prompt_future = executor.submit(self._test_prompts)
 
-            # Test frame processing
-            test_frames = {
-                "frames": [
-                    {"timestamp": 0, "description": "Test frame 1"},
-                    {"timestamp": 30, "description": "Test frame 2"}
-                ]
-            }
-
-            try:
-                frames = self.frame_processor.parse_frame_descriptions(test_frames)
-                windows = self.frame_processor.chunk_by_interval(frames, 1.0)
-                frame_test = {
-                    'success': True,
-                    'frames_parsed': len(frames),
-                    'windows_created': len(windows)
-                }
-            except Exception as e:
-                frame_test = {'success': False, 'error': str(e)}
-
-            # Test prompts
-            try:
-                system_prompt = self.prompt_manager.get_system_prompt()
-                user_prompt = self.prompt_manager.get_user_prompt()
-                prompt_test = {
-                    'success': True,
-                    'system_prompt_length': len(system_prompt),
-                    'user_prompt_length': len(user_prompt)
-                }
-            except Exception as e:
-                prompt_test = {'success': False, 'error': str(e)}
+                api_test = api_future.result()
+                frame_test = frame_future.result()
+                prompt_test = prompt_future.result()
 
             return {
                 'overall_status': api_test['success'] and frame_test['success'] and prompt_test['success'],
@@ -473,4 +885,39 @@ class CoachingEngine:
             return {
                 'overall_status': False,
                 'error': str(error)
-            }
\ No newline at end of file
+            }
+
+    def _test_frame_processing(self) -> Dict[str, Any]:
+        """Check that sample frames parse and chunk into windows."""
+
+        test_frames = {
+            "frames": [
+                {"timestamp": 0, "description": "Test frame 1"},
+                {"timestamp": 30, "description": "Test frame 2"}
+            ]
+        }
+
+        try:
+            frames = self.frame_processor.parse_frame_descriptions(test_frames)
+            windows = self.frame_processor.chunk_by_interval(frames, 1.0)
+            return {
+                'success': True,
+                'frames_parsed': len(frames),
+                'windows_created': len(windows)
+            }
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def _test_prompts(self) -> Dict[str, Any]:
+        """Check that the system and user prompts are available."""
+
+        try:
+            system_prompt = self.prompt_manager.get_system_prompt()
+            user_prompt = self.prompt_manager.get_user_prompt()
+            return {
+                'success': True,
+                'system_prompt_length': len(system_prompt),
+                'user_prompt_length': len(user_prompt)
+            }
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
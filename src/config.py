@@ -4,26 +4,34 @@ Loads settings from environment variables and provides defaults.
 """
 
 import os
-from typing import Dict, Any
+import sys
+from functools import lru_cache
+from typing import Dict, Any, Callable, Tuple
 from pathlib import Path
 
-# Try to load environment variables, but don't fail if dotenv is not available
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    # dotenv not available, likely in Streamlit Cloud
-    pass
+@lru_cache(maxsize=None)
+def load_environment() -> None:
+    """Load .env into the environment once, on first setting lookup."""
+    # Try to load environment variables, but don't fail if dotenv is not available
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        # dotenv not available, likely in Streamlit Cloud
+        pass
 
 # Try to get Streamlit secrets if available
 def get_streamlit_secret(key: str, default: str = '') -> str:
     """Get secret from Streamlit secrets if available."""
-    try:
-        import streamlit as st
-        if hasattr(st, 'secrets') and key in st.secrets:
-            return str(st.secrets[key])
-    except (ImportError, Exception):
-        pass
+    # Only consult secrets inside a Streamlit app; CLI use never pays for importing Streamlit
+    st = sys.modules.get('streamlit')
+    if st is not None:
+        try:
+            if hasattr(st, 'secrets') and key in st.secrets:
+                return str(st.secrets[key])
+        except Exception:
+            pass
+    load_environment()
     return os.getenv(key, default)
 
 def get_boolean_setting(key: str, default: bool = True) -> bool:
@@ -35,32 +43,93 @@ def get_boolean_setting(key: str, default: bool = True) -> bool:
         return value.lower() == 'true'
     return default
 
-class Config:
-    """Configuration settings for the coaching framework."""
-
+# Setting name -> (default, parser); each is read from secrets/environment on first access
+_SETTINGS_SPEC: Dict[str, Tuple[Any, Callable[[str], Any]]] = {
     # API Configuration
-    OPENAI_API_KEY: str = get_streamlit_secret('OPENAI_API_KEY', '')
-    DEFAULT_MODEL: str = get_streamlit_secret('DEFAULT_MODEL', 'gpt-5')
-    REASONING_EFFORT: str = get_streamlit_secret('REASONING_EFFORT', 'medium')
-    VERBOSITY: str = get_streamlit_secret('VERBOSITY', 'medium')
-    MAX_TOKENS: int = int(get_streamlit_secret('MAX_TOKENS', '4000'))
+    'OPENAI_API_KEY': ('', str),
+    'DEFAULT_MODEL': ('gpt-5', str),
+    'REASONING_EFFORT': ('medium', str),
+    'VERBOSITY': ('medium', str),
+    'MAX_TOKENS': ('4000', int),
     # Note: GPT-5 does not support temperature parameter
 
     # Processing Settings
-    DEFAULT_INTERVAL_MINUTES: float = float(get_streamlit_secret('DEFAULT_INTERVAL_MINUTES', '2'))
-    MAX_CONTEXT_WINDOWS: int = int(get_streamlit_secret('MAX_CONTEXT_WINDOWS', '3'))
-    RETRY_ATTEMPTS: int = int(get_streamlit_secret('RETRY_ATTEMPTS', '3'))
-    TIMEOUT_MS: int = int(get_streamlit_secret('TIMEOUT_MS', '60000'))
+    'DEFAULT_INTERVAL_MINUTES': ('2', float),
+    'MAX_CONTEXT_WINDOWS': ('3', int),
+    'RETRY_ATTEMPTS': ('3', int),
+    'TIMEOUT_MS': ('60000', int),
+    # Windows analyzed in parallel; 1 keeps each window's prompt chained to the previous recommendation
+    'MAX_CONCURRENCY': ('1', int),
+    # Requests per minute; halved automatically while the API is returning rate-limit errors
+    'MAX_RPM': ('500', int),
 
     # Output Settings
-    OUTPUT_DIR: str = get_streamlit_secret('OUTPUT_DIR', 'outputs')
-    LOGS_DIR: str = get_streamlit_secret('LOGS_DIR', 'logs')
-    ENABLE_LOGGING: bool = get_boolean_setting('ENABLE_LOGGING', True)
-    AUTO_SUMMARY: bool = get_boolean_setting('AUTO_SUMMARY', True)
+    'OUTPUT_DIR': ('outputs', str),
+    'LOGS_DIR': ('logs', str),
+    'ENABLE_LOGGING': (True, bool),
+    'AUTO_SUMMARY': (True, bool),
+    'ENABLE_RESPONSE_CACHE': (True, bool),
+    'RESPONSE_CACHE_TTL_SECONDS': ('604800', int),
 
     # Streamlit Settings
-    STREAMLIT_PORT: int = int(get_streamlit_secret('STREAMLIT_PORT', '8501'))
-    DEBUG_MODE: bool = get_boolean_setting('DEBUG_MODE', False)
+    'STREAMLIT_PORT': ('8501', int),
+    'DEBUG_MODE': (False, bool),
+}
+
+class _ConfigMeta(type):
+    """Resolves settings lazily and bumps Config._version whenever one is reassigned."""
+
+    def __getattr__(cls, name: str) -> Any:
+        if name not in _SETTINGS_SPEC:
+            raise AttributeError(f"type object '{cls.__name__}' has no attribute '{name}'")
+
+        default, parser = _SETTINGS_SPEC[name]
+        if parser is bool:
+            value = get_boolean_setting(name, default)
+        else:
+            value = parser(get_streamlit_secret(name, default))
+
+        # Cache on the class without counting it as a change
+        type.__setattr__(cls, name, value)
+        return value
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name.isupper():
+            super().__setattr__('_version', cls._version + 1)
+
+    def __delattr__(cls, name: str) -> None:
+        # Deleting a setting (e.g. when a test patch is undone) makes it re-resolve on next access
+        super().__delattr__(name)
+        if name.isupper():
+            super().__setattr__('_version', cls._version + 1)
+
+class Config(metaclass=_ConfigMeta):
+    """Configuration settings for the coaching framework."""
+
+    # Incremented on every setting change (directly or via update_setting)
+    _version: int = 0
+
+    # Settings are declared in _SETTINGS_SPEC and resolved on first access
+    OPENAI_API_KEY: str
+    DEFAULT_MODEL: str
+    REASONING_EFFORT: str
+    VERBOSITY: str
+    MAX_TOKENS: int
+    DEFAULT_INTERVAL_MINUTES: float
+    MAX_CONTEXT_WINDOWS: int
+    RETRY_ATTEMPTS: int
+    TIMEOUT_MS: int
+    MAX_CONCURRENCY: int
+    MAX_RPM: int
+    OUTPUT_DIR: str
+    LOGS_DIR: str
+    ENABLE_LOGGING: bool
+    AUTO_SUMMARY: bool
+    ENABLE_RESPONSE_CACHE: bool
+    RESPONSE_CACHE_TTL_SECONDS: int
+    STREAMLIT_PORT: int
+    DEBUG_MODE: bool
 
     @classmethod
     def ensure_directories(cls) -> None:
@@ -76,6 +145,12 @@ class Config:
     @classmethod
     def get_api_settings(cls) -> Dict[str, Any]:
         """Get API settings as dictionary."""
+        # Callers merge overrides into the result, so hand out a copy of the cached snapshot
+        return dict(cls._api_settings_snapshot(cls._version))
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _api_settings_snapshot(cls, version: int) -> Dict[str, Any]:
         return {
             'model_name': cls.DEFAULT_MODEL,
             'reasoning_effort': cls.REASONING_EFFORT,
@@ -95,6 +170,11 @@ class Config:
     @classmethod
     def to_dict(cls) -> Dict[str, Any]:
         """Export all settings as dictionary."""
+        return dict(cls._settings_snapshot(cls._version))
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _settings_snapshot(cls, version: int) -> Dict[str, Any]:
         return {
             'openai_api_key': '***CONFIGURED***' if cls.OPENAI_API_KEY else '',
             'default_model': cls.DEFAULT_MODEL,
@@ -106,9 +186,13 @@ class Config:
             'max_context_windows': cls.MAX_CONTEXT_WINDOWS,
             'retry_attempts': cls.RETRY_ATTEMPTS,
             'timeout_ms': cls.TIMEOUT_MS,
+            'max_concurrency': cls.MAX_CONCURRENCY,
+            'max_rpm': cls.MAX_RPM,
             'output_dir': cls.OUTPUT_DIR,
             'enable_logging': cls.ENABLE_LOGGING,
             'auto_summary': cls.AUTO_SUMMARY,
+            'enable_response_cache': cls.ENABLE_RESPONSE_CACHE,
+            'response_cache_ttl_seconds': cls.RESPONSE_CACHE_TTL_SECONDS,
         }
 
 # Initialize directories on import
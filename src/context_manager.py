@@ -4,16 +4,68 @@ Provides comprehensive context building and recommendation deduplication.
 """
 
 import json
+import orjson
+import re
 import uuid
-from typing import Dict, List, Any, Optional, Set
+from collections import Counter, OrderedDict
+from itertools import islice
+from typing import Dict, List, Any, Collection, Final, Iterator, Optional, Set, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
 from .database import DatabaseManager
 from .enhanced_window_processor import ProcessingWindow
-
-
-@dataclass
+from .utils import DATACLASS_OPTIONS
+
+# Keyword matching below uses re.IGNORECASE rather than lower(), so no lowercased copy of
+# recommendation or frame text is made; keep new keyword checks to the same pattern
+
+# Category keywords in priority order; each branch only looks ahead, so the first category whose
+# keywords appear anywhere in the text wins, matching the order of the original checks
+_CATEGORY_RE = re.compile(
+    r'^(?:(?=.*?(?:shortcut|keyboard|hotkey))(?P<shortcuts>)'
+    r'|(?=.*?(?:automation|automate|script))(?P<automation>)'
+    r'|(?=.*?(?:organize|structure|workflow))(?P<organization>)'
+    r'|(?=.*?(?:tool|software|app))(?P<tools>)'
+    r'|(?=.*?(?:time|efficiency|faster))(?P<efficiency>))',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Fixed parts of the context prompt
+_CONTEXT_HEADER_FORMAT: Final[str] = "**ANALYSIS CONTEXT FOR WINDOW {}**"
+
+_AVOID_REPEATS_NOTE: Final[str] = (
+    "\n**IMPORTANT**: Avoid repeating these recommendations unless significant new context warrants re-emphasis."
+)
+
+_ANALYSIS_INSTRUCTIONS: Final[str] = """
+**ANALYSIS INSTRUCTIONS:**
+1. Build upon the previous context without repeating already-made recommendations
+2. Focus on NEW inefficiencies or optimization opportunities specific to this window
+3. Consider how current activities relate to the broader workflow patterns
+4. Prioritize recommendations that haven't been suggested before
+5. If you identify the same issue again, provide a different solution or deeper analysis
+        """
+
+# One analysis line, surrounding whitespace excluded, classified by the first group that matches:
+# a recommendation header, a numbered step (1-3), an impact line, or other text not starting with '#'
+_ANALYSIS_LINE_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?P<header>#{2,3} Recommendation.*?)'
+    r'|(?P<step>[123]\..*?)'
+    r'|(?P<impact>.*?Impact:.*?)'
+    r'|(?P<text>[^#\s].*?)'
+    r')[^\S\n]*$',
+    re.MULTILINE
+)
+
+# Score annotation in a recommendation header, e.g. "(Score: 8.5/10)"; the title ends where it starts
+_SCORE_RE = re.compile(r'\(Score:\s*(?P<value>\d*\.?\d+)?')
+
+# Action keywords that mark a frame description as a workflow step
+_WORKFLOW_ACTION_RE = re.compile(r'click|type|select|navigate|open', re.IGNORECASE)
+
+@dataclass(frozen=True, **DATACLASS_OPTIONS)
 class ContextSummary:
     workflow_patterns: List[str]
     tools_used: List[str]
@@ -32,6 +84,9 @@ class ContextSummary:
             'time_range_covered': self.time_range_covered
         }
 
+    def to_json_bytes(self) -> bytes:
+        return orjson.dumps(self)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ContextSummary':
         return cls(
@@ -44,12 +99,43 @@ class ContextSummary:
         )
 
 
+class _RollingContext:
+    """Summaries of a session's most recent windows plus running counts of what they contain."""
+
+    def __init__(self):
+        self.summaries: 'OrderedDict[int, ContextSummary]' = OrderedDict()
+        self.tools: Counter = Counter()
+        self.patterns: Counter = Counter()
+        self.recommendations: Counter = Counter()
+
+    def add(self, window_number: int, summary: ContextSummary) -> None:
+        self.discard(window_number)
+        self.summaries[window_number] = summary
+        # Each summary counts once per distinct value, so discarding it undoes exactly its share
+        self.tools.update(dict.fromkeys(summary.tools_used, 1))
+        self.patterns.update(dict.fromkeys(summary.workflow_patterns, 1))
+        self.recommendations.update(dict.fromkeys(summary.previous_recommendations, 1))
+
+    def discard(self, window_number: int) -> None:
+        summary = self.summaries.pop(window_number, None)
+        if summary is not None:
+            self.tools -= Counter(dict.fromkeys(summary.tools_used, 1))
+            self.patterns -= Counter(dict.fromkeys(summary.workflow_patterns, 1))
+            self.recommendations -= Counter(dict.fromkeys(summary.previous_recommendations, 1))
+
+    def aggregates(self) -> Tuple[Collection[str], Collection[str], Collection[str]]:
+        # The live counters are handed out as-is (keys in first-seen order); callers only read them
+        return self.tools, self.patterns, self.recommendations
+
+
 class ContextManager:
     """Manages rolling context summaries and recommendation deduplication."""
 
     def __init__(self, db_manager: DatabaseManager, max_context_windows: int = 3):
         self.db_manager = db_manager
         self.max_context_windows = max_context_windows
+        # session_id -> summaries of the windows inside the current look-back range
+        self._rolling_context: Dict[str, _RollingContext] = {}
 
     def build_context_for_window(self, session_id: str, window_number: int,
                                 current_window: ProcessingWindow) -> str:
@@ -63,25 +149,31 @@ class ContextManager:
 
         # Build the context prompt
         context_prompt = self._build_context_prompt(
-            previous_summaries, current_context, window_number
+            previous_summaries, current_context, window_number,
+            aggregates=self._rolling_context[session_id].aggregates()
         )
 
         return context_prompt
 
     def _get_previous_summaries(self, session_id: str, window_number: int) -> List[ContextSummary]:
         """Get previous context summaries within the rolling window."""
-        summaries = []
+        rolling = self._rolling_context.setdefault(session_id, _RollingContext())
 
         # Look back up to max_context_windows
         start_window = max(1, window_number - self.max_context_windows)
 
-        for prev_window_num in range(start_window, window_number):
-            context_data = self.db_manager.get_context_summary(session_id, prev_window_num)
-            if context_data:
-                summary = ContextSummary.from_dict(context_data['summary_data'])
-                summaries.append(summary)
+        # Drop windows that have left the look-back range
+        for cached_window in [n for n in rolling.summaries if not start_window <= n < window_number]:
+            rolling.discard(cached_window)
 
-        return summaries
+        # Only windows not seen yet (normally just window_number - 1) are read, in a single query
+        missing = [n for n in range(start_window, window_number) if n not in rolling.summaries]
+        if missing:
+            for context_data in self.db_manager.get_context_summaries_range(session_id, missing[0], missing[-1]):
+                if context_data['window_number'] not in rolling.summaries:
+                    rolling.add(context_data['window_number'], ContextSummary.from_dict(context_data['summary_data']))
+
+        return [rolling.summaries[n] for n in sorted(rolling.summaries)]
 
     def _extract_window_context(self, window: ProcessingWindow) -> Dict[str, Any]:
         """Extract key contextual information from the current window."""
@@ -93,27 +185,32 @@ class ContextManager:
                 'workflow_description': "No activity in this window"
             }
 
-        # Collect unique applications, actions, and UI elements
-        applications = set()
-        user_actions = set()
-        ui_elements = set()
-        workflow_steps = []
+        # Collect unique applications, actions, and UI elements in one pass over the frames,
+        # with the bound methods hoisted out of the loop; dicts keep first-seen order so the
+        # prompt built from them is the same on every run
+        applications: Dict[str, None] = {}
+        user_actions: Dict[str, None] = {}
+        ui_elements: Dict[str, None] = {}
+        key_step = ""
+        add_applications = applications.update
+        add_user_actions = user_actions.update
+        add_ui_elements = ui_elements.update
+        find_action = _WORKFLOW_ACTION_RE.search
 
         for frame in window.frame_descriptions:
-            applications.update(frame.applications)
-            user_actions.update(frame.user_actions)
-            ui_elements.update(frame.ui_elements)
+            add_applications(dict.fromkeys(frame.applications))
+            add_user_actions(dict.fromkeys(frame.user_actions))
+            add_ui_elements(dict.fromkeys(frame.ui_elements))
 
-            # Extract workflow steps from forensic descriptions
-            if frame.forensic_description:
-                # Look for key action indicators
-                desc = frame.forensic_description.lower()
-                if any(keyword in desc for keyword in ['click', 'type', 'select', 'navigate', 'open']):
-                    workflow_steps.append(frame.forensic_description[:150])
+            # Keep the most informative (longest) workflow step among descriptions that mention
+            # a key action; descriptions that could not beat the current one skip the search
+            description = frame.forensic_description
+            if description and min(len(description), 150) > len(key_step) and find_action(description):
+                key_step = description[:150]
 
         # Generate workflow description
         workflow_description = self._generate_workflow_description(
-            list(applications), list(user_actions), workflow_steps
+            list(applications), list(user_actions), key_step
         )
 
         return {
@@ -126,7 +223,7 @@ class ContextManager:
 
     def _generate_workflow_description(self, applications: List[str],
                                      user_actions: List[str],
-                                     workflow_steps: List[str]) -> str:
+                                     key_step: str) -> str:
         """Generate a concise workflow description."""
         if not applications and not user_actions:
             return "No significant activity detected"
@@ -139,94 +236,98 @@ class ContextManager:
                 apps_str += f" (and {len(applications) - 3} others)"
             description_parts.append(f"User working in {apps_str}")
 
-        if workflow_steps:
-            # Use the most informative workflow step
-            key_step = max(workflow_steps, key=len) if workflow_steps else ""
-            if key_step:
-                description_parts.append(f"Key activity: {key_step}")
+        if key_step:
+            description_parts.append(f"Key activity: {key_step}")
 
         return ". ".join(description_parts)
 
     def _build_context_prompt(self, previous_summaries: List[ContextSummary],
                              current_context: Dict[str, Any],
-                             window_number: int) -> str:
-        """Build the context prompt for GPT-5."""
-
-        context_sections = []
+                             window_number: int,
+                             aggregates: Optional[Tuple[Collection[str], Collection[str], Collection[str]]] = None) -> str:
+        """Build the context prompt for GPT-5.
+
+        aggregates holds the distinct tools, patterns and recommendations of previous_summaries
+        when the caller already has them; otherwise they are collected here.
+        """
+        return "\n".join(self._iter_context_sections(
+            previous_summaries, current_context, window_number, aggregates
+        ))
+
+    def _iter_context_sections(self, previous_summaries: List[ContextSummary],
+                               current_context: Dict[str, Any],
+                               window_number: int,
+                               aggregates: Optional[Tuple[Collection[str], Collection[str], Collection[str]]]) -> Iterator[str]:
+        """Yield the sections of the context prompt in order."""
 
         # Add session overview
-        context_sections.append(f"**ANALYSIS CONTEXT FOR WINDOW {window_number}**")
+        yield _CONTEXT_HEADER_FORMAT.format(window_number)
 
         if previous_summaries:
-            context_sections.append("\n**PREVIOUS WORKFLOW CONTEXT:**")
+            yield "\n**PREVIOUS WORKFLOW CONTEXT:**"
 
             # Aggregate information from previous windows
-            all_tools = set()
-            all_patterns = set()
-            all_recommendations = set()
-
-            for summary in previous_summaries:
-                all_tools.update(summary.tools_used)
-                all_patterns.update(summary.workflow_patterns)
-                all_recommendations.update(summary.previous_recommendations)
+            if aggregates is None:
+                all_tools: Dict[str, None] = {}
+                all_patterns: Dict[str, None] = {}
+                all_recommendations: Dict[str, None] = {}
+
+                for summary in previous_summaries:
+                    all_tools.update(dict.fromkeys(summary.tools_used))
+                    all_patterns.update(dict.fromkeys(summary.workflow_patterns))
+                    all_recommendations.update(dict.fromkeys(summary.previous_recommendations))
+            else:
+                all_tools, all_patterns, all_recommendations = aggregates
 
             if all_tools:
-                context_sections.append(f"Tools previously used: {', '.join(list(all_tools)[:10])}")
+                yield f"Tools previously used: {', '.join(islice(all_tools, 10))}"
 
             if all_patterns:
-                context_sections.append(f"Workflow patterns observed: {'; '.join(list(all_patterns)[:5])}")
+                yield f"Workflow patterns observed: {'; '.join(islice(all_patterns, 5))}"
 
             if all_recommendations:
-                context_sections.append("Previous recommendations made:")
-                for i, rec in enumerate(list(all_recommendations)[:5], 1):
-                    context_sections.append(f"  {i}. {rec}")
-                context_sections.append("\n**IMPORTANT**: Avoid repeating these recommendations unless significant new context warrants re-emphasis.")
+                yield "Previous recommendations made:"
+                for i, rec in enumerate(islice(all_recommendations, 5), 1):
+                    yield f"  {i}. {rec}"
+                yield _AVOID_REPEATS_NOTE
 
         # Add current window context
-        context_sections.append(f"\n**CURRENT WINDOW ANALYSIS ({current_context.get('time_range', 'Unknown range')}):**")
-        context_sections.append(f"Applications in use: {', '.join(current_context.get('applications', ['None']))}")
-        context_sections.append(f"User actions: {', '.join(current_context.get('user_actions', ['None']))}")
-        context_sections.append(f"Workflow: {current_context.get('workflow_description', 'No description available')}")
+        yield f"\n**CURRENT WINDOW ANALYSIS ({current_context.get('time_range', 'Unknown range')}):**"
+        yield f"Applications in use: {', '.join(current_context.get('applications', ['None']))}"
+        yield f"User actions: {', '.join(current_context.get('user_actions', ['None']))}"
+        yield f"Workflow: {current_context.get('workflow_description', 'No description available')}"
 
         # Add analysis instructions
-        context_sections.append("""
-**ANALYSIS INSTRUCTIONS:**
-1. Build upon the previous context without repeating already-made recommendations
-2. Focus on NEW inefficiencies or optimization opportunities specific to this window
-3. Consider how current activities relate to the broader workflow patterns
-4. Prioritize recommendations that haven't been suggested before
-5. If you identify the same issue again, provide a different solution or deeper analysis
-        """)
-
-        return "\n".join(context_sections)
+        yield _ANALYSIS_INSTRUCTIONS
 
     def extract_recommendations_from_analysis(self, analysis_text: str) -> List[Dict[str, Any]]:
         """Extract structured recommendations from GPT-5 analysis text."""
         recommendations = []
 
-        # Simple extraction based on markdown structure
-        lines = analysis_text.split('\n')
+        # Simple extraction based on markdown structure, scanned line by line in one regex pass
         current_recommendation = None
 
-        for line in lines:
-            line = line.strip()
+        # Text fragments of the current recommendation, joined once the block ends
+        text_parts: List[str] = []
+        text_length = 0
 
-            # Look for recommendation headers
-            if line.startswith('### Recommendation') or line.startswith('## Recommendation'):
+        for match in _ANALYSIS_LINE_RE.finditer(analysis_text):
+            kind = match.lastgroup
+
+            # Recommendation headers
+            if kind == 'header':
                 if current_recommendation:
+                    current_recommendation['recommendation_text'] = ' '.join(text_parts)
                     recommendations.append(current_recommendation)
 
                 # Extract title and score if present
-                title = line.replace('### Recommendation', '').replace('## Recommendation', '').strip()
+                title = match['header'].replace('### Recommendation', '').replace('## Recommendation', '').strip()
                 score_match = None
-                if '(Score:' in title:
-                    parts = title.split('(Score:')
-                    title = parts[0].strip()
-                    score_text = parts[1].replace(')', '').strip()
-                    try:
-                        score_match = float(score_text.split('/')[0])
-                    except:
-                        score_match = None
+                score = _SCORE_RE.search(title)
+                if score:
+                    title = title[:score.start()].strip()
+                    if score['value']:
+                        score_match = float(score['value'])
 
                 current_recommendation = {
                     'recommendation_text': title,
@@ -235,24 +336,29 @@ class ContextManager:
                     'implementation_steps': [],
                     'expected_impact': ''
                 }
+                text_parts = [title]
+                text_length = len(title)
 
-            # Look for implementation steps
-            elif line.startswith('1.') or line.startswith('2.') or line.startswith('3.'):
-                if current_recommendation:
-                    current_recommendation['implementation_steps'].append(line)
+            elif current_recommendation is None:
+                continue
 
-            # Look for expected impact
-            elif 'Expected Impact:' in line or 'Impact:' in line:
-                if current_recommendation:
-                    current_recommendation['expected_impact'] = line.split(':')[1].strip()
+            # Implementation steps
+            elif kind == 'step':
+                current_recommendation['implementation_steps'].append(match['step'])
+
+            # Expected impact
+            elif kind == 'impact':
+                current_recommendation['expected_impact'] = match['impact'].split(':')[1].strip()
 
             # Add to recommendation text if we're in a recommendation block
-            elif current_recommendation and line and not line.startswith('#'):
-                if len(current_recommendation['recommendation_text']) < 500:  # Avoid very long texts
-                    current_recommendation['recommendation_text'] += ' ' + line
+            elif text_length < 500:  # Avoid very long texts
+                line = match['text']
+                text_parts.append(line)
+                text_length += 1 + len(line)
 
         # Add the last recommendation
         if current_recommendation:
+            current_recommendation['recommendation_text'] = ' '.join(text_parts)
             recommendations.append(current_recommendation)
 
         # If no structured recommendations found, create a general one
@@ -269,20 +375,8 @@ class ContextManager:
 
     def _categorize_recommendation(self, text: str) -> str:
         """Categorize a recommendation based on its content."""
-        text_lower = text.lower()
-
-        if any(word in text_lower for word in ['shortcut', 'keyboard', 'hotkey']):
-            return 'shortcuts'
-        elif any(word in text_lower for word in ['automation', 'automate', 'script']):
-            return 'automation'
-        elif any(word in text_lower for word in ['organize', 'structure', 'workflow']):
-            return 'organization'
-        elif any(word in text_lower for word in ['tool', 'software', 'app']):
-            return 'tools'
-        elif any(word in text_lower for word in ['time', 'efficiency', 'faster']):
-            return 'efficiency'
-        else:
-            return 'general'
+        match = _CATEGORY_RE.match(text)
+        return match.lastgroup if match else 'general'
 
     def save_window_context(self, session_id: str, window_number: int,
                           window_context: Dict[str, Any],
@@ -309,13 +403,18 @@ class ContextManager:
             context_id=context_id,
             session_id=session_id,
             window_number=window_number,
-            summary_data=summary.to_dict(),
+            summary_data=summary.to_json_bytes(),
             workflow_patterns=summary.workflow_patterns,
             tools_used=summary.tools_used,
             previous_recommendations=summary.previous_recommendations
         )
 
         if success:
+            # A re-analyzed window must not keep serving its old summary from the rolling cache
+            rolling = self._rolling_context.get(session_id)
+            if rolling is not None:
+                rolling.discard(window_number)
+
             # Also save recommendations
             self.db_manager.save_recommendations(session_id, window_number, recommendations)
             logger.info(f"Saved context and {len(recommendations)} recommendations for window {window_number}")
@@ -327,35 +426,23 @@ class ContextManager:
     def get_session_workflow_summary(self, session_id: str) -> Dict[str, Any]:
         """Get a comprehensive workflow summary for the entire session."""
 
-        # Get all recommendations for the session
-        recommendations = self.db_manager.get_session_recommendations(session_id)
-
-        # Get all windows for the session
-        windows = self.db_manager.get_session_windows(session_id)
-
-        # Aggregate tools and patterns
-        all_tools = set()
-        all_patterns = set()
+        # Recommendation counts per category, computed by the database
+        category_counts = self.db_manager.get_recommendation_category_counts(session_id)
 
-        for window_num in range(1, len(windows) + 1):
-            context = self.db_manager.get_context_summary(session_id, window_num)
-            if context:
-                all_tools.update(context.get('tools_used', []))
-                all_patterns.update(context.get('workflow_patterns', []))
+        # Window counts per status, without loading the windows themselves
+        window_counts = self.db_manager.get_window_status_counts(session_id)
 
-        # Categorize recommendations
-        category_counts = {}
-        for rec in recommendations:
-            category = rec.get('category', 'general')
-            category_counts[category] = category_counts.get(category, 0) + 1
+        # Distinct tools and patterns across the session
+        all_tools = self.db_manager.get_distinct_tools(session_id)
+        all_patterns = self.db_manager.get_distinct_patterns(session_id)
 
         return {
-            'total_recommendations': len(recommendations),
-            'tools_identified': list(all_tools),
-            'workflow_patterns': list(all_patterns),
+            'total_recommendations': sum(category_counts.values()),
+            'tools_identified': all_tools,
+            'workflow_patterns': all_patterns,
             'recommendation_categories': category_counts,
             'processing_status': {
-                'total_windows': len(windows),
-                'completed_windows': len([w for w in windows if w['status'] == 'completed'])
+                'total_windows': sum(window_counts.values()),
+                'completed_windows': window_counts.get('completed', 0)
             }
         }
\ No newline at end of file
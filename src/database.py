@@ -3,14 +3,21 @@ Database models and management for the AI Coaching Framework.
 Provides session management, window tracking, and recommendation storage.
 """
 
-import json
+import hashlib
+import orjson
 import sqlite3
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from itertools import product
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Hashable, Iterator, Tuple, Union
 from dataclasses import dataclass
 from pathlib import Path
 
+from .utils import DATACLASS_OPTIONS
+
 
 class SessionStatus(Enum):
     CREATED = "created"
@@ -76,28 +83,243 @@ class ProcessingConfig:
         )
 
 
+@dataclass(**DATACLASS_OPTIONS)
+class WindowRow:
+    """A stored window, with its input and output payloads decoded."""
+    id: str
+    session_id: str
+    window_number: int
+    status: str
+    start_time: float
+    end_time: float
+    input_data: Any
+    output_data: Any
+    error_message: Optional[str]
+    processing_time_seconds: Optional[float]
+    created_at: str
+    updated_at: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "session_id": self.session_id,
+            "window_number": self.window_number,
+            "status": self.status,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "input_data": self.input_data,
+            "output_data": self.output_data,
+            "error_message": self.error_message,
+            "processing_time_seconds": self.processing_time_seconds,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+def _dumps(value: Any) -> bytes:
+    """Encode a value as UTF-8 JSON, bound as a BLOB so SQLite stores the bytes without transcoding."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _window_row(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> WindowRow:
+    """Build a WindowRow, with decoded payloads, from a row in get_session_windows column order."""
+    (window_id, session_id, window_number, status, start_time, end_time, input_data,
+     output_data, error_message, processing_time_seconds, created_at, updated_at) = row
+    return WindowRow(
+        window_id,
+        session_id,
+        window_number,
+        status,
+        start_time,
+        end_time,
+        orjson.loads(input_data) if input_data else input_data,
+        orjson.loads(output_data) if output_data else output_data,
+        error_message,
+        processing_time_seconds,
+        created_at,
+        updated_at,
+    )
+
+
+def _recommendation_row(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Build a recommendation dict from a row in get_session_recommendations column order."""
+    (rec_id, session_id, window_number, recommendation_text, category,
+     confidence_score, implementation_steps, expected_impact, created_at) = row
+    return {
+        'id': rec_id,
+        'session_id': session_id,
+        'window_number': window_number,
+        'recommendation_text': recommendation_text,
+        'category': category,
+        'confidence_score': confidence_score,
+        'implementation_steps': orjson.loads(implementation_steps) if implementation_steps else implementation_steps,
+        'expected_impact': expected_impact,
+        'created_at': created_at,
+    }
+
+
+def _text_digest(text: str) -> str:
+    """Stable short digest of text; unlike hash(), identical across processes and restarts."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+# Session metadata is kept narrow so listing sessions never reads the configs (notably the
+# system prompt); each config field lives in its own column of session_configs
+_SESSIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        status TEXT NOT NULL,
+        input_file_path TEXT,
+        total_windows INTEGER DEFAULT 0,
+        completed_windows INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        completed_at TIMESTAMP
+    )
+"""
+
+_SESSION_CONFIGS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS session_configs (
+        session_id TEXT PRIMARY KEY,
+        gpt_model TEXT NOT NULL,
+        reasoning_effort TEXT NOT NULL,
+        verbosity TEXT NOT NULL,
+        window_seconds INTEGER NOT NULL,
+        system_prompt TEXT NOT NULL,
+        enable_web_search INTEGER NOT NULL,
+        enable_tool_calling INTEGER NOT NULL,
+        FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE
+    )
+"""
+
+# Config values of older sessions tables, by layout: JSON blobs, or columns on sessions itself
+_LEGACY_SESSION_CONFIG_SELECTS = {
+    'gpt_config': """
+        COALESCE(json_extract(gpt_config, '$.model'), 'gpt-5'),
+        COALESCE(json_extract(gpt_config, '$.reasoning_effort'), 'medium'),
+        COALESCE(json_extract(gpt_config, '$.verbosity'), 'medium'),
+        COALESCE(json_extract(processing_config, '$.window_seconds'), 30),
+        COALESCE(json_extract(processing_config, '$.system_prompt'), ''),
+        COALESCE(json_extract(processing_config, '$.enable_web_search'), 1),
+        COALESCE(json_extract(processing_config, '$.enable_tool_calling'), 1)
+    """,
+    'gpt_model': """
+        gpt_model, reasoning_effort, verbosity, window_seconds, system_prompt,
+        enable_web_search, enable_tool_calling
+    """,
+}
+
+# Sessions that may still make progress. Spelled out literally in SQL: the planner only uses the
+# partial index idx_sessions_active_updated for queries repeating its exact predicate
+_ACTIVE_SESSION_STATUSES_SQL = "('{}', '{}', '{}')".format(
+    SessionStatus.CREATED.value, SessionStatus.PROCESSING.value, SessionStatus.PAUSED.value
+)
+
+# Windows decoded per fetch by iter_session_windows
+WINDOW_FETCH_SIZE = 64
+
+# update_window_status statements keyed by which optional columns are given (output_data,
+# error_message, processing_time_seconds), so a status-only change leaves the others untouched
+_UPDATE_WINDOW_SQL = {
+    mask: "UPDATE windows SET status = ?, {}updated_at = CURRENT_TIMESTAMP WHERE id = ?".format(
+        ''.join(f"{column} = ?, " for column, given in zip(
+            ('output_data', 'error_message', 'processing_time_seconds'), mask) if given)
+    )
+    for mask in product((False, True), repeat=3)
+}
+
+# Prepared statements kept per connection; comfortably above the number of distinct queries here
+STATEMENT_CACHE_SIZE = 256
+# Decoded get_session / get_context_summary results kept per DatabaseManager
+LOOKUP_CACHE_SIZE = 1024
+
+
 class DatabaseManager:
     def __init__(self, db_path: str = "coaching_sessions.db"):
         self.db_path = db_path
+        # One long-lived connection in autocommit mode, shared by every thread under _lock;
+        # transaction() opens explicit transactions on it. Its statement cache (keyed by SQL text)
+        # keeps every query below prepared after first use
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                                     cached_statements=STATEMENT_CACHE_SIZE)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        # LRU caches of decoded lookups, filled only outside transactions (so a rolled-back
+        # write can never be cached) and invalidated by this manager's writes to those rows
+        self._session_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._context_cache: 'OrderedDict[Tuple[str, int], Dict[str, Any]]' = OrderedDict()
+
+        # 8 KB pages keep the B-trees of rows carrying JSON payloads shallower. This only takes
+        # effect on a new database file, so it must run before WAL mode creates the file
+        self._conn.execute("PRAGMA page_size=8192")
+        # WAL lets readers proceed during writes and makes commits far cheaper; the rest keeps
+        # temp tables and a 64 MB page cache in memory and maps up to 256 MB of the file
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-64000")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+
         self.init_database()
 
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Yield the shared connection; statements auto-commit unless inside transaction()."""
+        with self._lock:
+            yield self._conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run every DatabaseManager write inside the block as a single transaction.
+
+        Commits once on exit and rolls back if the block raises. Nested calls join the
+        outer transaction. Keep the block free of awaits: the shared connection stays
+        locked to this thread, and holds the database write lock, until commit.
+        """
+        with self._lock:
+            conn = self._conn
+            if conn.in_transaction:
+                yield conn
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def _cache_lookup(self, cache: 'OrderedDict', key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = cache.get(key)
+            if cached is None:
+                return None
+            cache.move_to_end(key)
+        # Hand out a copy so callers adding keys never change the cached entry
+        return dict(cached)
+
+    def _cache_store(self, cache: 'OrderedDict', key: Hashable, value: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._conn.in_transaction:
+                return
+            cache[key] = dict(value)
+            if len(cache) > LOOKUP_CACHE_SIZE:
+                cache.popitem(last=False)
+
     def init_database(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    input_file_path TEXT,
-                    total_windows INTEGER DEFAULT 0,
-                    completed_windows INTEGER DEFAULT 0,
-                    gpt_config TEXT NOT NULL,
-                    processing_config TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TIMESTAMP
-                )
-            """)
+        with self.transaction() as conn:
+            conn.execute(_SESSIONS_TABLE_SQL.format(table="sessions"))
+            conn.execute(_SESSION_CONFIGS_TABLE_SQL)
+            self._migrate_session_configs(conn)
 
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS windows (
@@ -107,8 +329,8 @@ class DatabaseManager:
                     status TEXT NOT NULL,
                     start_time REAL,
                     end_time REAL,
-                    input_data TEXT,
-                    output_data TEXT,
+                    input_data BLOB,
+                    output_data BLOB,
                     error_message TEXT,
                     processing_time_seconds REAL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -123,16 +345,56 @@ class DatabaseManager:
                     id TEXT PRIMARY KEY,
                     session_id TEXT NOT NULL,
                     window_number INTEGER NOT NULL,
-                    summary_data TEXT NOT NULL,
-                    workflow_patterns TEXT,
-                    tools_used TEXT,
-                    previous_recommendations TEXT,
+                    summary_data BLOB NOT NULL,
+                    workflow_patterns BLOB,
+                    tools_used BLOB,
+                    previous_recommendations BLOB,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE,
                     UNIQUE (session_id, window_number)
                 )
             """)
 
+            # Tools and patterns of each window, one row per value, so distinct values are queried in SQL
+            backfill_side_tables = not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'session_tools'"
+            ).fetchone()
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_tools (
+                    session_id TEXT NOT NULL,
+                    window_number INTEGER NOT NULL,
+                    tool TEXT NOT NULL,
+                    FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE,
+                    PRIMARY KEY (session_id, window_number, tool)
+                )
+            """)
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_patterns (
+                    session_id TEXT NOT NULL,
+                    window_number INTEGER NOT NULL,
+                    pattern TEXT NOT NULL,
+                    FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE,
+                    PRIMARY KEY (session_id, window_number, pattern)
+                )
+            """)
+
+            if backfill_side_tables:
+                # Databases created before the side tables existed keep these values only as JSON
+                conn.execute("""
+                    INSERT OR IGNORE INTO session_tools (session_id, window_number, tool)
+                    SELECT cs.session_id, cs.window_number, j.value
+                    FROM context_summaries cs, json_each(cs.tools_used) j
+                    WHERE json_valid(cs.tools_used)
+                """)
+                conn.execute("""
+                    INSERT OR IGNORE INTO session_patterns (session_id, window_number, pattern)
+                    SELECT cs.session_id, cs.window_number, j.value
+                    FROM context_summaries cs, json_each(cs.workflow_patterns) j
+                    WHERE json_valid(cs.workflow_patterns)
+                """)
+
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS recommendations (
                     id TEXT PRIMARY KEY,
@@ -141,7 +403,7 @@ class DatabaseManager:
                     recommendation_text TEXT NOT NULL,
                     category TEXT,
                     confidence_score REAL,
-                    implementation_steps TEXT,
+                    implementation_steps BLOB,
                     expected_impact TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE
@@ -150,86 +412,158 @@ class DatabaseManager:
 
             # Create indexes for better performance
             conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status)")
+            # Lets list_active_sessions skip the completed/failed majority and read in order
+            conn.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_sessions_active_updated ON sessions(updated_at DESC)
+                WHERE status IN {_ACTIVE_SESSION_STATUSES_SQL}
+            """)
             conn.execute("CREATE INDEX IF NOT EXISTS idx_windows_session_status ON windows(session_id, status)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_recommendations_session ON recommendations(session_id)")
+            # Serves get_session_recommendations' filter and ORDER BY without a sort step; the old
+            # session-only index is a prefix of it. windows and context_summaries are already
+            # covered by their UNIQUE (session_id, window_number) indexes
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_recs_session_window_created "
+                         "ON recommendations(session_id, window_number, created_at)")
+            conn.execute("DROP INDEX IF EXISTS idx_recommendations_session")
+
+    def _migrate_session_configs(self, conn: sqlite3.Connection) -> None:
+        """Move configs still stored on an older sessions table into session_configs."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+        legacy_column = next((c for c in _LEGACY_SESSION_CONFIG_SELECTS if c in columns), None)
+        if legacy_column is None:
+            return
+
+        conn.execute(f"""
+            INSERT OR IGNORE INTO session_configs
+            SELECT id, {_LEGACY_SESSION_CONFIG_SELECTS[legacy_column]}
+            FROM sessions
+        """)
+        conn.execute(_SESSIONS_TABLE_SQL.format(table="sessions_migrated"))
+        conn.execute("""
+            INSERT INTO sessions_migrated
+            SELECT id, name, status, input_file_path, total_windows, completed_windows,
+                   created_at, updated_at, completed_at
+            FROM sessions
+        """)
+        conn.execute("DROP TABLE sessions")
+        conn.execute("ALTER TABLE sessions_migrated RENAME TO sessions")
 
     def create_session(self, session_id: str, name: str, gpt_config: GPTConfig,
                       processing_config: ProcessingConfig, input_file_path: str = None) -> bool:
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.transaction() as conn:
                 conn.execute("""
-                    INSERT INTO sessions (id, name, status, input_file_path, gpt_config, processing_config)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    INSERT INTO sessions (id, name, status, input_file_path)
+                    VALUES (?, ?, ?, ?)
+                """, (session_id, name, SessionStatus.CREATED.value, input_file_path))
+                conn.execute("""
+                    INSERT INTO session_configs (session_id, gpt_model, reasoning_effort, verbosity,
+                                                 window_seconds, system_prompt, enable_web_search,
+                                                 enable_tool_calling)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     session_id,
-                    name,
-                    SessionStatus.CREATED.value,
-                    input_file_path,
-                    json.dumps(gpt_config.to_dict()),
-                    json.dumps(processing_config.to_dict())
+                    gpt_config.model,
+                    gpt_config.reasoning_effort,
+                    gpt_config.verbosity,
+                    processing_config.window_seconds,
+                    processing_config.system_prompt,
+                    processing_config.enable_web_search,
+                    processing_config.enable_tool_calling
                 ))
             return True
         except sqlite3.IntegrityError:
             return False
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        cached = self._cache_lookup(self._session_cache, session_id)
+        if cached is not None:
+            return cached
+
+        with self._connection() as conn:
             cursor = conn.execute("""
-                SELECT * FROM sessions WHERE id = ?
+                SELECT s.id, s.name, s.status, s.input_file_path, s.total_windows, s.completed_windows,
+                       c.gpt_model, c.reasoning_effort, c.verbosity, c.window_seconds, c.system_prompt,
+                       c.enable_web_search, c.enable_tool_calling, s.created_at, s.updated_at, s.completed_at
+                FROM sessions s JOIN session_configs c ON c.session_id = s.id
+                WHERE s.id = ?
             """, (session_id,))
             row = cursor.fetchone()
 
             if row:
-                session_dict = dict(row)
-                session_dict['gpt_config'] = GPTConfig.from_dict(json.loads(session_dict['gpt_config']))
-                session_dict['processing_config'] = ProcessingConfig.from_dict(json.loads(session_dict['processing_config']))
-                return session_dict
+                session = {
+                    'id': row['id'],
+                    'name': row['name'],
+                    'status': row['status'],
+                    'input_file_path': row['input_file_path'],
+                    'total_windows': row['total_windows'],
+                    'completed_windows': row['completed_windows'],
+                    'gpt_config': GPTConfig(
+                        model=row['gpt_model'],
+                        reasoning_effort=row['reasoning_effort'],
+                        verbosity=row['verbosity'],
+                    ),
+                    'processing_config': ProcessingConfig(
+                        window_seconds=row['window_seconds'],
+                        system_prompt=row['system_prompt'],
+                        enable_web_search=bool(row['enable_web_search']),
+                        enable_tool_calling=bool(row['enable_tool_calling']),
+                    ),
+                    'created_at': row['created_at'],
+                    'updated_at': row['updated_at'],
+                    'completed_at': row['completed_at'],
+                }
+                self._cache_store(self._session_cache, session_id, session)
+                return session
             return None
 
     def update_session_status(self, session_id: str, status: SessionStatus,
                             completed_windows: int = None) -> bool:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                if completed_windows is not None:
-                    conn.execute("""
-                        UPDATE sessions
-                        SET status = ?, completed_windows = ?, updated_at = CURRENT_TIMESTAMP,
-                            completed_at = CASE WHEN ? = 'completed' THEN CURRENT_TIMESTAMP ELSE completed_at END
-                        WHERE id = ?
-                    """, (status.value, completed_windows, status.value, session_id))
-                else:
-                    conn.execute("""
-                        UPDATE sessions
-                        SET status = ?, updated_at = CURRENT_TIMESTAMP,
-                            completed_at = CASE WHEN ? = 'completed' THEN CURRENT_TIMESTAMP ELSE completed_at END
-                        WHERE id = ?
-                    """, (status.value, status.value, session_id))
+            # Same format as SQLite's CURRENT_TIMESTAMP; only set when the session completes
+            completed_at = (
+                datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+                if status is SessionStatus.COMPLETED else None
+            )
+            with self._connection() as conn:
+                self._session_cache.pop(session_id, None)
+                conn.execute("""
+                    UPDATE sessions
+                    SET status = ?, completed_windows = COALESCE(?, completed_windows),
+                        updated_at = CURRENT_TIMESTAMP, completed_at = COALESCE(?, completed_at)
+                    WHERE id = ?
+                """, (status.value, completed_windows, completed_at, session_id))
             return True
         except sqlite3.Error:
             return False
 
     def list_sessions(self, status: SessionStatus = None) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-
-            if status:
-                cursor = conn.execute("""
-                    SELECT id, name, status, total_windows, completed_windows, created_at, updated_at
-                    FROM sessions WHERE status = ? ORDER BY updated_at DESC
-                """, (status.value,))
-            else:
-                cursor = conn.execute("""
-                    SELECT id, name, status, total_windows, completed_windows, created_at, updated_at
-                    FROM sessions ORDER BY updated_at DESC
-                """)
+        with self._connection() as conn:
+            # One statement for both the filtered and unfiltered listing
+            cursor = conn.execute("""
+                SELECT id, name, status, total_windows, completed_windows, created_at, updated_at
+                FROM sessions
+                WHERE (:status IS NULL OR status = :status)
+                ORDER BY updated_at DESC
+            """, {'status': status.value if status else None})
+
+            return [dict(row) for row in cursor.fetchall()]
+
+    def list_active_sessions(self) -> List[Dict[str, Any]]:
+        """List created, processing and paused sessions, most recently updated first."""
+        with self._connection() as conn:
+            cursor = conn.execute(f"""
+                SELECT id, name, status, total_windows, completed_windows, created_at, updated_at
+                FROM sessions
+                WHERE status IN {_ACTIVE_SESSION_STATUSES_SQL}
+                ORDER BY updated_at DESC
+            """)
 
             return [dict(row) for row in cursor.fetchall()]
 
     def create_window(self, window_id: str, session_id: str, window_number: int,
                      start_time: float, end_time: float, input_data: Dict[str, Any]) -> bool:
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 conn.execute("""
                     INSERT INTO windows (id, session_id, window_number, status, start_time, end_time, input_data)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -240,7 +574,7 @@ class DatabaseManager:
                     WindowStatus.PENDING.value,
                     start_time,
                     end_time,
-                    json.dumps(input_data)
+                    _dumps(input_data)
                 ))
             return True
         except sqlite3.IntegrityError:
@@ -249,130 +583,227 @@ class DatabaseManager:
     def update_window_status(self, window_id: str, status: WindowStatus,
                            output_data: Dict[str, Any] = None, error_message: str = None,
                            processing_time: float = None) -> bool:
+        optional = (
+            _dumps(output_data) if output_data is not None else None,
+            error_message,
+            processing_time
+        )
+        mask = tuple(value is not None for value in optional)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    UPDATE windows
-                    SET status = ?, output_data = ?, error_message = ?, processing_time_seconds = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (
+            with self._connection() as conn:
+                conn.execute(_UPDATE_WINDOW_SQL[mask], (
                     status.value,
-                    json.dumps(output_data) if output_data else None,
-                    error_message,
-                    processing_time,
+                    *(value for value in optional if value is not None),
                     window_id
                 ))
             return True
         except sqlite3.Error:
             return False
 
-    def get_session_windows(self, session_id: str) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM windows
+    def iter_session_windows(self, session_id: str) -> Iterator[WindowRow]:
+        """
+        Yield a session's windows in order, fetching and decoding them a page at a time.
+
+        The connection is only locked while a page is fetched, so the caller may use this
+        DatabaseManager (including writes) between windows.
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _window_row
+            cursor.execute("""
+                SELECT id, session_id, window_number, status, start_time, end_time, input_data,
+                       output_data, error_message, processing_time_seconds, created_at, updated_at
+                FROM windows
                 WHERE session_id = ?
                 ORDER BY window_number
             """, (session_id,))
 
-            windows = []
-            for row in cursor.fetchall():
-                window_dict = dict(row)
-                if window_dict['input_data']:
-                    window_dict['input_data'] = json.loads(window_dict['input_data'])
-                if window_dict['output_data']:
-                    window_dict['output_data'] = json.loads(window_dict['output_data'])
-                windows.append(window_dict)
+        try:
+            while True:
+                with self._connection():
+                    page = cursor.fetchmany(WINDOW_FETCH_SIZE)
+                if not page:
+                    return
+                yield from page
+        finally:
+            cursor.close()
 
-            return windows
+    def get_session_windows(self, session_id: str) -> List[Dict[str, Any]]:
+        # Kept dict-shaped for existing callers; iter_session_windows yields WindowRow objects
+        return [row.to_dict() for row in self.iter_session_windows(session_id)]
+
+    def get_window_status_counts(self, session_id: str) -> Dict[str, int]:
+        with self._connection() as conn:
+            cursor = conn.execute("""
+                SELECT status, COUNT(*) FROM windows
+                WHERE session_id = ?
+                GROUP BY status
+            """, (session_id,))
+            return dict(cursor.fetchall())
 
     def save_context_summary(self, context_id: str, session_id: str, window_number: int,
-                           summary_data: Dict[str, Any], workflow_patterns: List[str] = None,
+                           summary_data: Union[Dict[str, Any], bytes], workflow_patterns: List[str] = None,
                            tools_used: List[str] = None, previous_recommendations: List[str] = None) -> bool:
+        # summary_data may arrive already serialized (see ContextSummary.to_json_bytes)
+        summary_json = summary_data if isinstance(summary_data, bytes) else _dumps(summary_data)
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.transaction() as conn:
+                self._context_cache.pop((session_id, window_number), None)
                 conn.execute("""
-                    INSERT OR REPLACE INTO context_summaries
+                    INSERT INTO context_summaries
                     (id, session_id, window_number, summary_data, workflow_patterns, tools_used, previous_recommendations)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (session_id, window_number) DO UPDATE SET
+                        summary_data = excluded.summary_data,
+                        workflow_patterns = excluded.workflow_patterns,
+                        tools_used = excluded.tools_used,
+                        previous_recommendations = excluded.previous_recommendations
                 """, (
                     context_id,
                     session_id,
                     window_number,
-                    json.dumps(summary_data),
-                    json.dumps(workflow_patterns or []),
-                    json.dumps(tools_used or []),
-                    json.dumps(previous_recommendations or [])
+                    summary_json,
+                    _dumps(workflow_patterns or []),
+                    _dumps(tools_used or []),
+                    _dumps(previous_recommendations or [])
                 ))
+
+                # Replace the window's rows in the side tables
+                conn.execute("DELETE FROM session_tools WHERE session_id = ? AND window_number = ?",
+                             (session_id, window_number))
+                conn.execute("DELETE FROM session_patterns WHERE session_id = ? AND window_number = ?",
+                             (session_id, window_number))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO session_tools (session_id, window_number, tool) VALUES (?, ?, ?)",
+                    [(session_id, window_number, tool) for tool in tools_used or []]
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO session_patterns (session_id, window_number, pattern) VALUES (?, ?, ?)",
+                    [(session_id, window_number, pattern) for pattern in workflow_patterns or []]
+                )
             return True
         except sqlite3.Error:
             return False
 
+    @staticmethod
+    def _decode_context_row(row: sqlite3.Row) -> Dict[str, Any]:
+        context_dict = dict(row)
+        for column in ('summary_data', 'workflow_patterns', 'tools_used', 'previous_recommendations'):
+            context_dict[column] = orjson.loads(context_dict[column])
+        return context_dict
+
     def get_context_summary(self, session_id: str, window_number: int) -> Optional[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        key = (session_id, window_number)
+        cached = self._cache_lookup(self._context_cache, key)
+        if cached is not None:
+            return cached
+
+        with self._connection() as conn:
             cursor = conn.execute("""
                 SELECT * FROM context_summaries
                 WHERE session_id = ? AND window_number = ?
-            """, (session_id, window_number))
+            """, key)
 
             row = cursor.fetchone()
-            if row:
-                context_dict = dict(row)
-                context_dict['summary_data'] = json.loads(context_dict['summary_data'])
-                context_dict['workflow_patterns'] = json.loads(context_dict['workflow_patterns'])
-                context_dict['tools_used'] = json.loads(context_dict['tools_used'])
-                context_dict['previous_recommendations'] = json.loads(context_dict['previous_recommendations'])
-                return context_dict
-            return None
+            if not row:
+                return None
+            context = self._decode_context_row(row)
+            self._cache_store(self._context_cache, key, context)
+            return context
+
+    def get_context_summaries_range(self, session_id: str, start_window: int,
+                                    end_window: int) -> List[Dict[str, Any]]:
+        """Get the context summaries of windows start_window..end_window (inclusive) in one query."""
+        with self._connection() as conn:
+            cursor = conn.execute("""
+                SELECT * FROM context_summaries
+                WHERE session_id = ? AND window_number BETWEEN ? AND ?
+                ORDER BY window_number
+            """, (session_id, start_window, end_window))
+
+            return [self._decode_context_row(row) for row in cursor.fetchall()]
+
+    def get_distinct_tools(self, session_id: str) -> List[str]:
+        with self._connection() as conn:
+            cursor = conn.execute("""
+                SELECT DISTINCT tool FROM session_tools
+                WHERE session_id = ?
+                ORDER BY tool
+            """, (session_id,))
+            return [row[0] for row in cursor.fetchall()]
+
+    def get_distinct_patterns(self, session_id: str) -> List[str]:
+        with self._connection() as conn:
+            cursor = conn.execute("""
+                SELECT DISTINCT pattern FROM session_patterns
+                WHERE session_id = ?
+                ORDER BY pattern
+            """, (session_id,))
+            return [row[0] for row in cursor.fetchall()]
 
     def save_recommendations(self, session_id: str, window_number: int,
                            recommendations: List[Dict[str, Any]]) -> bool:
+        # Hash ids and encode payloads up front so the write lock is held only for the insert
+        id_prefix = f"{session_id}_w{window_number}_r"
+        rows = [
+            (
+                id_prefix + _text_digest(rec.get('recommendation_text', '')),
+                session_id,
+                window_number,
+                rec.get('recommendation_text', ''),
+                rec.get('category', ''),
+                rec.get('confidence_score', 0.0),
+                _dumps(rec.get('implementation_steps', [])),
+                rec.get('expected_impact', '')
+            )
+            for rec in recommendations
+        ]
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for rec in recommendations:
-                    rec_id = f"{session_id}_w{window_number}_r{hash(rec.get('recommendation_text', ''))}"
-                    conn.execute("""
-                        INSERT OR REPLACE INTO recommendations
-                        (id, session_id, window_number, recommendation_text, category,
-                         confidence_score, implementation_steps, expected_impact)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        rec_id,
-                        session_id,
-                        window_number,
-                        rec.get('recommendation_text', ''),
-                        rec.get('category', ''),
-                        rec.get('confidence_score', 0.0),
-                        json.dumps(rec.get('implementation_steps', [])),
-                        rec.get('expected_impact', '')
-                    ))
+            with self.transaction() as conn:
+                conn.executemany("""
+                    INSERT INTO recommendations
+                    (id, session_id, window_number, recommendation_text, category,
+                     confidence_score, implementation_steps, expected_impact)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        category = excluded.category,
+                        confidence_score = excluded.confidence_score,
+                        implementation_steps = excluded.implementation_steps,
+                        expected_impact = excluded.expected_impact
+                """, rows)
             return True
         except sqlite3.Error:
             return False
 
     def get_session_recommendations(self, session_id: str) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM recommendations
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _recommendation_row
+            cursor.execute("""
+                SELECT id, session_id, window_number, recommendation_text, category,
+                       confidence_score, implementation_steps, expected_impact, created_at
+                FROM recommendations
                 WHERE session_id = ?
                 ORDER BY window_number, created_at
             """, (session_id,))
+            return cursor.fetchall()
 
-            recommendations = []
-            for row in cursor.fetchall():
-                rec_dict = dict(row)
-                if rec_dict['implementation_steps']:
-                    rec_dict['implementation_steps'] = json.loads(rec_dict['implementation_steps'])
-                recommendations.append(rec_dict)
-
-            return recommendations
+    def get_recommendation_category_counts(self, session_id: str) -> Dict[str, int]:
+        with self._connection() as conn:
+            cursor = conn.execute("""
+                SELECT COALESCE(category, 'general'), COUNT(*) FROM recommendations
+                WHERE session_id = ?
+                GROUP BY COALESCE(category, 'general')
+            """, (session_id,))
+            return dict(cursor.fetchall())
 
     def delete_session(self, session_id: str) -> bool:
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.transaction() as conn:
+                self._session_cache.pop(session_id, None)
+                for key in [key for key in self._context_cache if key[0] == session_id]:
+                    del self._context_cache[key]
+                conn.execute("DELETE FROM session_configs WHERE session_id = ?", (session_id,))
                 conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
             return True
         except sqlite3.Error:
@@ -3,14 +3,75 @@ Enhanced window processor with time-based windowing and comprehensive context ex
 Integrates with the existing frame processor for backward compatibility.
 """
 
-import json
+import ijson
+import orjson
+import sys
 import uuid
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from bisect import bisect_left
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter, le
+from pathlib import Path
+from typing import Dict, List, Any, BinaryIO, Optional, Tuple, Iterable, Iterator
+from dataclasses import dataclass, field
 from loguru import logger
 
-
-@dataclass
+from .utils import DATACLASS_OPTIONS
+
+
+# Line-delimited frame dumps (one JSON object per line) are streamed instead of loaded whole
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+JSONL_READ_BUFFER_BYTES = 65536
+
+# Paths (in ijson prefix notation) streamed out of a windowed JSON dump
+_JSON_FRAME_PREFIX = 'windows.item.frame_descriptions.item'
+_JSON_METADATA_DEFAULTS = {
+    'video': '',
+    'duration_seconds': 0,
+    'fps': 1,
+    'window_seconds': 30,
+    'model': '',
+    'processing_method': '',
+}
+_JSON_SCALAR_EVENTS = frozenset(('null', 'boolean', 'integer', 'double', 'number', 'string'))
+# Marks a dump whose 'windows' field holds no window to validate
+_NO_WINDOW = object()
+
+# Sort key for frames. Timsort already finishes already-ordered input (the usual case) in one
+# linear pass, so there is no separate is-sorted check
+_frame_timestamp = attrgetter('raw_timestamp_seconds')
+
+# Upper bound on windows built for one session by create_windows_from_frames
+MAX_WINDOWS = 1000
+
+
+# Frames repeat the same few timestamp strings, so parsed values are memoized
+@lru_cache(maxsize=131072)
+def _parse_timestamp_to_seconds(timestamp: str) -> float:
+    try:
+        parts = timestamp.split(':')
+        if len(parts) == 3:  # HH:MM:SS
+            hours, minutes, seconds = parts
+            return float(hours) * 3600 + float(minutes) * 60 + float(seconds)
+        elif len(parts) == 2:  # MM:SS
+            minutes, seconds = parts
+            return float(minutes) * 60 + float(seconds)
+        else:  # Just seconds
+            return float(timestamp)
+    except (ValueError, IndexError) as e:
+        logger.warning(f"Failed to parse timestamp '{timestamp}': {e}")
+        return 0.0
+
+
+def _intern_tags(tags: Any) -> Any:
+    """Intern a frame's tag strings; the same few apps and actions repeat across every frame."""
+    if type(tags) is not list:
+        return tags
+    return [sys.intern(tag) if type(tag) is str else tag for tag in tags]
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class FrameDescription:
     timestamp: str
     forensic_description: str
@@ -18,20 +79,40 @@ class FrameDescription:
     ui_elements: List[str]
     user_actions: List[str]
     raw_timestamp_seconds: float = 0.0
+    # Export dicts, built on first use and shared by every later export (treat them as read-only)
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _legacy_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._dict is None:
+            self._dict = dict(self.to_legacy_dict(), raw_timestamp_seconds=self.raw_timestamp_seconds)
+        return self._dict
+
+    def to_legacy_dict(self) -> Dict[str, Any]:
+        """The frame as found in legacy window dumps, without the parsed timestamp."""
+        if self._legacy_dict is None:
+            self._legacy_dict = {
+                'timestamp': self.timestamp,
+                'forensic_description': self.forensic_description,
+                'applications': self.applications,
+                'ui_elements': self.ui_elements,
+                'user_actions': self.user_actions
+            }
+        return self._legacy_dict
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FrameDescription':
         return cls(
             timestamp=data.get('timestamp', ''),
             forensic_description=data.get('forensic_description', ''),
-            applications=data.get('applications', []),
-            ui_elements=data.get('ui_elements', []),
-            user_actions=data.get('user_actions', []),
+            applications=_intern_tags(data.get('applications', [])),
+            ui_elements=_intern_tags(data.get('ui_elements', [])),
+            user_actions=_intern_tags(data.get('user_actions', [])),
             raw_timestamp_seconds=data.get('raw_timestamp_seconds', 0.0)
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ProcessingWindow:
     window_number: int
     start_time: float
@@ -52,21 +133,52 @@ class ProcessingWindow:
             'end_time': self.end_time,
             'duration': self.get_duration(),
             'frame_count': self.get_frame_count(),
-            'frame_descriptions': [
-                {
-                    'timestamp': fd.timestamp,
-                    'forensic_description': fd.forensic_description,
-                    'applications': fd.applications,
-                    'ui_elements': fd.ui_elements,
-                    'user_actions': fd.user_actions,
-                    'raw_timestamp_seconds': fd.raw_timestamp_seconds
-                }
-                for fd in self.frame_descriptions
-            ],
+            'frame_descriptions': [fd.to_dict() for fd in self.frame_descriptions],
             'window_analysis': self.window_analysis
         }
 
 
+class _WindowAggregate:
+    """Running tag counts over a sequence of frames; frames join at the back and leave at the front."""
+
+    def __init__(self):
+        self.frames: deque = deque()
+        self.applications: Counter = Counter()
+        self.ui_elements: Counter = Counter()
+        self.user_actions: Counter = Counter()
+        # (frame, activity) pairs, in frame order
+        self.key_activities: deque = deque()
+
+    def push(self, frame: FrameDescription) -> None:
+        self.frames.append(frame)
+        self.applications.update(frame.applications)
+        self.ui_elements.update(frame.ui_elements)
+        self.user_actions.update(frame.user_actions)
+
+        # Extract key activities from forensic descriptions
+        if frame.forensic_description and len(frame.forensic_description) > 50:
+            self.key_activities.append((frame, frame.forensic_description[:200] + "..."))
+
+    def pop(self) -> FrameDescription:
+        frame = self.frames.popleft()
+        for counter, tags in ((self.applications, frame.applications),
+                              (self.ui_elements, frame.ui_elements),
+                              (self.user_actions, frame.user_actions)):
+            for tag in tags:
+                counter[tag] -= 1
+                if not counter[tag]:
+                    del counter[tag]
+
+        if self.key_activities and self.key_activities[0][0] is frame:
+            self.key_activities.popleft()
+        return frame
+
+    def clear(self) -> None:
+        for container in (self.frames, self.applications, self.ui_elements, self.user_actions,
+                          self.key_activities):
+            container.clear()
+
+
 class EnhancedWindowProcessor:
     """Enhanced window processor with time-based windowing."""
 
@@ -76,56 +188,96 @@ class EnhancedWindowProcessor:
     @staticmethod
     def parse_timestamp_to_seconds(timestamp: str) -> float:
         """Convert timestamp string (HH:MM:SS or MM:SS) to seconds."""
-        try:
-            parts = timestamp.split(':')
-            if len(parts) == 3:  # HH:MM:SS
-                hours, minutes, seconds = map(float, parts)
-                return hours * 3600 + minutes * 60 + seconds
-            elif len(parts) == 2:  # MM:SS
-                minutes, seconds = map(float, parts)
-                return minutes * 60 + seconds
-            else:  # Just seconds
-                return float(timestamp)
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Failed to parse timestamp '{timestamp}': {e}")
-            return 0.0
-
-    def load_frame_descriptions_from_json(self, json_file_path: str) -> Tuple[List[FrameDescription], Dict[str, Any]]:
-        """Load frame descriptions from a JSON file and extract metadata."""
-        try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Extract metadata
-            metadata = {
-                'video': data.get('video', ''),
-                'duration_seconds': data.get('duration_seconds', 0),
-                'fps': data.get('fps', 1),
-                'window_seconds': data.get('window_seconds', 30),
-                'model': data.get('model', ''),
-                'processing_method': data.get('processing_method', ''),
-                'total_windows': len(data.get('windows', []))
-            }
-
-            # Extract frame descriptions from all windows
-            frame_descriptions = []
-            windows_data = data.get('windows', [])
+        return _parse_timestamp_to_seconds(timestamp)
 
-            for window_data in windows_data:
-                window_frames = window_data.get('frame_descriptions', [])
+    @staticmethod
+    def is_jsonl_file(json_file_path: str) -> bool:
+        """Check whether a frame dump is line-delimited JSON (one record per line)."""
+        return Path(json_file_path).suffix.lower() in JSONL_EXTENSIONS
+
+    def _build_frame_description(self, frame_data: Dict[str, Any]) -> FrameDescription:
+        """Create a FrameDescription with its timestamp resolved to seconds."""
+        get = frame_data.get
+        return FrameDescription(
+            timestamp=get('timestamp', ''),
+            forensic_description=get('forensic_description', ''),
+            applications=_intern_tags(get('applications', [])),
+            ui_elements=_intern_tags(get('ui_elements', [])),
+            user_actions=_intern_tags(get('user_actions', [])),
+            raw_timestamp_seconds=_parse_timestamp_to_seconds(get('timestamp', '00:00:00'))
+        )
 
-                for frame_data in window_frames:
+    @staticmethod
+    def _iter_jsonl_records(json_file_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield one parsed JSON object per non-empty line of a JSONL file."""
+        with open(json_file_path, 'rb', buffering=JSONL_READ_BUFFER_BYTES) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError as e:
+                    logger.warning(f"Skipping malformed line {line_number} in {json_file_path}: {e}")
+                    continue
+                if not isinstance(record, dict):
+                    logger.warning(f"Skipping invalid record on line {line_number}: {type(record)}")
+                    continue
+                yield record
+
+    def iter_frame_descriptions_from_jsonl(self, json_file_path: str) -> Iterator[FrameDescription]:
+        """
+        Stream frame descriptions from a JSONL file without loading it into memory.
+
+        Each line is either a single frame, a window object carrying a
+        'frame_descriptions' list, or a metadata header (no 'timestamp'), which is skipped.
+        """
+        for record in self._iter_jsonl_records(json_file_path):
+            if 'frame_descriptions' in record:
+                for frame_data in record.get('frame_descriptions') or []:
                     if not isinstance(frame_data, dict):
                         logger.warning(f"Skipping invalid frame data: {type(frame_data)}")
                         continue
-                    timestamp_seconds = self.parse_timestamp_to_seconds(frame_data.get('timestamp', '00:00:00'))
+                    yield self._build_frame_description(frame_data)
+            elif 'timestamp' in record:
+                yield self._build_frame_description(record)
+
+    def load_jsonl_metadata(self, json_file_path: str) -> Dict[str, Any]:
+        """Read session metadata from the header line of a JSONL file, if present."""
+        header = next(self._iter_jsonl_records(json_file_path), {})
+        if 'timestamp' in header or 'frame_descriptions' in header:
+            header = {}
+
+        return {
+            'video': header.get('video', ''),
+            'duration_seconds': header.get('duration_seconds', 0),
+            'fps': header.get('fps', 1),
+            'window_seconds': header.get('window_seconds', self.window_seconds),
+            'model': header.get('model', ''),
+            'processing_method': header.get('processing_method', ''),
+            'total_windows': header.get('total_windows', 0)
+        }
+
+    def load_frame_descriptions_from_json(self, json_file_path: str) -> Tuple[List[FrameDescription], Dict[str, Any]]:
+        """Load frame descriptions from a JSON (or JSONL) file and extract metadata."""
+        if self.is_jsonl_file(json_file_path):
+            try:
+                frame_descriptions = list(self.iter_frame_descriptions_from_jsonl(json_file_path))
+                frame_descriptions.sort(key=_frame_timestamp)
+                metadata = self.load_jsonl_metadata(json_file_path)
+
+                logger.info(f"Loaded {len(frame_descriptions)} frame descriptions from {json_file_path}")
+                return frame_descriptions, metadata
 
-                    frame_desc = FrameDescription.from_dict(frame_data)
-                    frame_desc.raw_timestamp_seconds = timestamp_seconds
-                    frame_descriptions.append(frame_desc)
+            except Exception as e:
+                logger.error(f"Failed to load frame descriptions from {json_file_path}: {e}")
+                raise
+
+        try:
+            metadata: Dict[str, Any] = {}
+            frame_descriptions = list(self.iter_frame_descriptions_from_json(json_file_path, metadata))
 
             # Sort by timestamp
-            frame_descriptions.sort(key=lambda x: x.raw_timestamp_seconds)
+            frame_descriptions.sort(key=_frame_timestamp)
 
             logger.info(f"Loaded {len(frame_descriptions)} frame descriptions from {json_file_path}")
             return frame_descriptions, metadata
@@ -134,54 +286,192 @@ class EnhancedWindowProcessor:
             logger.error(f"Failed to load frame descriptions from {json_file_path}: {e}")
             raise
 
+    def iter_frame_descriptions_from_json(self, json_file_path: str,
+                                          metadata: Optional[Dict[str, Any]] = None) -> Iterator[FrameDescription]:
+        """
+        Stream frame descriptions from a windowed JSON dump in document order.
+
+        Only one frame's dict is built at a time. If a metadata dict is passed, the dump's
+        metadata is filled into it as it is read; it is complete once the frames are exhausted.
+        """
+        if metadata is None:
+            metadata = {}
+        metadata.update(_JSON_METADATA_DEFAULTS, total_windows=0)
+        # Bound once; the loop below runs for every parse event in the file
+        build_frame = self._build_frame_description
+        frame_event = None
+
+        with open(json_file_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if frame_event is not None:
+                    frame_event(event, value)
+                    if event == 'end_map' and prefix == _JSON_FRAME_PREFIX:
+                        yield build_frame(frame_builder.value)
+                        frame_event = None
+                elif prefix == _JSON_FRAME_PREFIX:
+                    if event == 'start_map':
+                        frame_builder = ijson.ObjectBuilder()
+                        frame_event = frame_builder.event
+                        frame_event(event, value)
+                    elif event != 'end_array':
+                        logger.warning(f"Skipping invalid frame data: {event}")
+                elif prefix == 'windows.item' and event not in ('map_key', 'end_map', 'end_array'):
+                    metadata['total_windows'] += 1
+                elif prefix in _JSON_METADATA_DEFAULTS and event in _JSON_SCALAR_EVENTS:
+                    metadata[prefix] = value
+
+    def iter_windows_from_json(self, json_file_path: str) -> Iterator[ProcessingWindow]:
+        """
+        Stream processing windows straight from a windowed JSON dump whose frames are in time order.
+
+        Frames go from the parser into windows without ever being held in a list; pair with
+        aggregate_windows to extract each window's context in the same pass. Dumps whose frames
+        may be out of order should go through load_frame_descriptions_from_json, which sorts.
+        """
+        return self.iter_windows_from_frames(self.iter_frame_descriptions_from_json(json_file_path))
+
     def create_windows_from_frames(self, frame_descriptions: List[FrameDescription]) -> List[ProcessingWindow]:
         """Create time-based windows from frame descriptions."""
         if not frame_descriptions:
             return []
 
-        windows = []
-        current_window_start = 0.0
-        window_number = 1
-
-        while True:
-            window_end = current_window_start + self.window_seconds
-
-            # Find frames within this window
-            window_frames = [
-                frame for frame in frame_descriptions
-                if current_window_start <= frame.raw_timestamp_seconds < window_end
-            ]
-
-            # If no frames in this window and we're beyond all frames, break
-            if not window_frames:
-                max_timestamp = max(frame.raw_timestamp_seconds for frame in frame_descriptions) if frame_descriptions else 0
-                if current_window_start >= max_timestamp:
-                    break
-
-            # Create window even if it has no frames (for completeness)
-            window = ProcessingWindow(
-                window_number=window_number,
-                start_time=current_window_start,
-                end_time=window_end,
+        timestamps = list(map(_frame_timestamp, frame_descriptions))
+        # Loaded frames arrive sorted, making the last timestamp the latest; check in one pass
+        # over neighbouring pairs that stops at the first inversion and builds no sorted copy
+        in_order = all(map(le, timestamps, islice(timestamps, 1, None)))
+        latest = timestamps[-1] if in_order else max(timestamps)
+
+        # Windows run from 0 up to and including the one holding the latest frame; empty gaps are kept
+        window_count = int(latest // self.window_seconds) + 1
+        if window_count <= 0:
+            return []
+
+        # Safety check against a corrupt timestamp allocating millions of empty windows
+        if window_count > MAX_WINDOWS:  # Reasonable upper limit
+            logger.warning("Reached maximum window limit, stopping window creation")
+            window_count = MAX_WINDOWS
+
+        if in_order:
+            # Cut each window's run of frames at its start boundary
+            bounds = [bisect_left(timestamps, index * self.window_seconds) for index in range(window_count + 1)]
+            buckets = [frame_descriptions[bounds[index]:bounds[index + 1]] for index in range(window_count)]
+        else:
+            # Drop each frame into its window's bucket in one pass, keeping input order within a window
+            buckets = [[] for _ in range(window_count)]
+            for frame, timestamp in zip(frame_descriptions, timestamps):
+                if timestamp >= 0:
+                    index = int(timestamp // self.window_seconds)
+                    if index < window_count:
+                        buckets[index].append(frame)
+
+        windows = [
+            ProcessingWindow(
+                window_number=index + 1,
+                start_time=float(index * self.window_seconds),
+                end_time=float((index + 1) * self.window_seconds),
                 frame_descriptions=window_frames
             )
+            for index, window_frames in enumerate(buckets)
+        ]
 
-            windows.append(window)
+        logger.info(f"Created {len(windows)} windows with {self.window_seconds}s duration each")
+        return windows
 
-            current_window_start = window_end
-            window_number += 1
+    def iter_windows_from_frames(self, frame_descriptions: Iterable[FrameDescription]) -> Iterator[ProcessingWindow]:
+        """
+        Stream time-based windows from timestamp-ordered frames.
+
+        Each window is yielded as soon as a frame past its end_time arrives, so memory
+        is bounded by one window rather than the whole input. Like create_windows_from_frames,
+        at most MAX_WINDOWS windows are produced and later frames are dropped. Unlike it, the
+        input is not sorted: a frame whose window has already been yielded is dropped with a
+        warning instead of being placed.
+        """
+        window_index = 0
+        window_frames: List[FrameDescription] = []
+        seen_frames = False
+        limit_reached = False
+
+        for frame in frame_descriptions:
+            timestamp = frame.raw_timestamp_seconds
+            index = int(timestamp // self.window_seconds) if timestamp >= 0 else -1
+
+            if index < window_index:
+                logger.warning(f"Frame at {frame.timestamp} is out of order; its window was already emitted, dropping it")
+                continue
+
+            # Safety check against a corrupt timestamp emitting millions of empty windows
+            if index >= MAX_WINDOWS:
+                if not limit_reached:
+                    logger.warning("Reached maximum window limit, stopping window creation")
+                    limit_reached = True
+                continue
+
+            # Close every window (including empty gaps) that ends before this frame
+            while window_index < index:
+                yield self._window_at(window_index, window_frames)
+                window_frames = []
+                window_index += 1
+
+            window_frames.append(frame)
+            seen_frames = True
+
+        if seen_frames:
+            yield self._window_at(window_index, window_frames)
+
+    def _window_at(self, index: int, window_frames: List[FrameDescription]) -> ProcessingWindow:
+        """Build the zero-based index-th window over the given frames."""
+        return ProcessingWindow(
+            window_number=index + 1,
+            start_time=float(index * self.window_seconds),
+            end_time=float((index + 1) * self.window_seconds),
+            frame_descriptions=window_frames
+        )
 
-            # Safety check to prevent infinite loops
-            if window_number > 1000:  # Reasonable upper limit
-                logger.warning("Reached maximum window limit, stopping window creation")
-                break
+    def iter_session_windows(self, json_file_path: str) -> Iterator[ProcessingWindow]:
+        """Yield processing windows for a file, streaming JSONL inputs end to end."""
+        if self.is_jsonl_file(json_file_path):
+            return self.iter_windows_from_frames(self.iter_frame_descriptions_from_jsonl(json_file_path))
 
-        logger.info(f"Created {len(windows)} windows with {self.window_seconds}s duration each")
-        return windows
+        frame_descriptions, _ = self.load_frame_descriptions_from_json(json_file_path)
+        return iter(self.create_windows_from_frames(frame_descriptions))
 
     def extract_window_context(self, window: ProcessingWindow) -> Dict[str, Any]:
         """Extract contextual information from a window for summarization."""
-        if not window.frame_descriptions:
+        aggregate = _WindowAggregate()
+        for frame in window.frame_descriptions:
+            aggregate.push(frame)
+        return self._context_from_aggregate(window, aggregate)
+
+    def aggregate_windows(self, windows: Iterable[ProcessingWindow]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield extract_window_context's result for each of a sequence of time-ordered windows.
+
+        Aggregates are carried from one window to the next: frames before the new window's
+        start leave and frames past the previous window's end join, so overlapping (sliding)
+        windows only pay for the frames that changed. Disjoint windows start from scratch.
+        """
+        aggregate = _WindowAggregate()
+        previous_end = None
+
+        for window in windows:
+            if previous_end is None or window.start_time >= previous_end:
+                aggregate.clear()
+                arriving = window.frame_descriptions
+            else:
+                while aggregate.frames and aggregate.frames[0].raw_timestamp_seconds < window.start_time:
+                    aggregate.pop()
+                arriving = [frame for frame in window.frame_descriptions
+                            if frame.raw_timestamp_seconds >= previous_end]
+
+            for frame in arriving:
+                aggregate.push(frame)
+            previous_end = window.end_time
+
+            yield self._context_from_aggregate(window, aggregate)
+
+    def _context_from_aggregate(self, window: ProcessingWindow, aggregate: _WindowAggregate) -> Dict[str, Any]:
+        if not aggregate.frames:
             return {
                 'applications_used': [],
                 'ui_elements_interacted': [],
@@ -189,34 +479,23 @@ class EnhancedWindowProcessor:
                 'workflow_summary': "No activity detected in this window"
             }
 
-        # Aggregate information across all frames in the window
-        all_applications = set()
-        all_ui_elements = set()
-        all_user_actions = set()
-        key_activities = []
-
-        for frame in window.frame_descriptions:
-            all_applications.update(frame.applications)
-            all_ui_elements.update(frame.ui_elements)
-            all_user_actions.update(frame.user_actions)
-
-            # Extract key activities from forensic descriptions
-            if frame.forensic_description and len(frame.forensic_description) > 50:
-                key_activities.append(frame.forensic_description[:200] + "...")
+        # Most frequent first, so the summary's top three are the dominant apps and actions
+        applications = [app for app, _ in aggregate.applications.most_common()]
+        user_actions = [action for action, _ in aggregate.user_actions.most_common()]
 
         # Generate a summary of the workflow for this window
         workflow_summary = self._generate_workflow_summary(
-            list(all_applications),
-            list(all_user_actions),
-            key_activities
+            applications,
+            user_actions,
+            [activity for _, activity in aggregate.key_activities]
         )
 
         return {
-            'applications_used': list(all_applications),
-            'ui_elements_interacted': list(all_ui_elements),
-            'user_actions_performed': list(all_user_actions),
+            'applications_used': applications,
+            'ui_elements_interacted': list(aggregate.ui_elements),
+            'user_actions_performed': user_actions,
             'workflow_summary': workflow_summary,
-            'frame_count': len(window.frame_descriptions),
+            'frame_count': len(aggregate.frames),
             'time_range': f"{window.start_time:.1f}s - {window.end_time:.1f}s"
         }
 
@@ -274,20 +553,22 @@ class EnhancedWindowProcessor:
 
     def validate_json_structure(self, json_file_path: str) -> Tuple[bool, str]:
         """Validate that a JSON file has the expected structure for processing."""
+        if self.is_jsonl_file(json_file_path):
+            return self._validate_jsonl_structure(json_file_path)
+
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Only the first window is read, so validating never costs a second full parse
+            with open(json_file_path, 'rb') as f:
+                has_windows, first_window = self._read_first_json_window(f)
 
             # Check for required top-level fields
-            if 'windows' not in data:
+            if not has_windows:
                 return False, "Missing 'windows' field in JSON structure"
 
-            windows = data['windows']
-            if not isinstance(windows, list) or len(windows) == 0:
+            if first_window is _NO_WINDOW:
                 return False, "No windows found in JSON file"
 
             # Check first window structure
-            first_window = windows[0]
             if 'frame_descriptions' not in first_window:
                 return False, "Missing 'frame_descriptions' in window structure"
 
@@ -304,11 +585,72 @@ class EnhancedWindowProcessor:
 
             return True, "JSON structure is valid for processing"
 
-        except json.JSONDecodeError as e:
+        except ijson.JSONError as e:
             return False, f"Invalid JSON format: {e}"
         except Exception as e:
             return False, f"Error validating JSON: {e}"
 
+    @staticmethod
+    def _read_first_json_window(f: BinaryIO) -> Tuple[bool, Any]:
+        """
+        Stream a windowed JSON dump up to the end of its first window.
+
+        Returns whether the top-level 'windows' field exists, and its first item
+        (_NO_WINDOW if the field is not a non-empty array).
+        """
+        events = ijson.parse(f, use_float=True)
+        for prefix, event, value in events:
+            if prefix != 'windows':
+                continue
+            if event != 'start_array':
+                return True, _NO_WINDOW
+
+            prefix, event, value = next(events)
+            if event == 'end_array':
+                return True, _NO_WINDOW
+
+            builder = ijson.ObjectBuilder()
+            depth = 0
+            while True:
+                builder.event(event, value)
+                if event in ('start_map', 'start_array'):
+                    depth += 1
+                elif event in ('end_map', 'end_array'):
+                    depth -= 1
+                if depth == 0:
+                    return True, builder.value
+                prefix, event, value = next(events)
+
+        return False, _NO_WINDOW
+
+    def _validate_jsonl_structure(self, json_file_path: str) -> Tuple[bool, str]:
+        """Validate a JSONL file by inspecting its first frame record only."""
+        try:
+            for record in self._iter_jsonl_records(json_file_path):
+                if 'frame_descriptions' in record:
+                    frames = record['frame_descriptions']
+                    if not isinstance(frames, list) or len(frames) == 0:
+                        continue
+                    first_frame = frames[0]
+                elif 'timestamp' in record:
+                    first_frame = record
+                else:
+                    continue
+
+                if not isinstance(first_frame, dict):
+                    return False, "Invalid frame description in JSONL file"
+
+                for field in ['timestamp', 'forensic_description']:
+                    if field not in first_frame:
+                        return False, f"Missing required field '{field}' in frame description"
+
+                return True, "JSONL structure is valid for processing"
+
+            return False, "No frame descriptions found in JSONL file"
+
+        except Exception as e:
+            return False, f"Error validating JSONL: {e}"
+
     def get_processing_stats(self, windows: List[ProcessingWindow]) -> Dict[str, Any]:
         """Get statistics about the processing windows."""
         if not windows:
@@ -321,50 +663,40 @@ class EnhancedWindowProcessor:
                 'time_range': "0.0s - 0.0s"
             }
 
-        total_frames = sum(window.get_frame_count() for window in windows)
         total_duration = windows[-1].end_time - windows[0].start_time
 
-        # Count application usage across all windows
-        app_counts = {}
+        # Count frames and application usage across all windows in one pass
+        total_frames = 0
+        app_counts = Counter()
         for window in windows:
+            total_frames += len(window.frame_descriptions)
             for frame in window.frame_descriptions:
-                for app in frame.applications:
-                    app_counts[app] = app_counts.get(app, 0) + 1
+                app_counts.update(frame.applications)
 
         return {
             'total_windows': len(windows),
             'total_frames': total_frames,
             'total_duration': total_duration,
             'avg_frames_per_window': total_frames / len(windows) if windows else 0.0,
-            'applications_summary': dict(sorted(app_counts.items(), key=lambda x: x[1], reverse=True)),
+            'applications_summary': dict(app_counts.most_common()),
             'time_range': f"{windows[0].start_time:.1f}s - {windows[-1].end_time:.1f}s"
         }
 
-    def convert_to_legacy_format(self, windows: List[ProcessingWindow]) -> Dict[str, Any]:
-        """Convert enhanced windows to legacy format for backward compatibility."""
-        legacy_windows = []
-
+    def iter_legacy_windows(self, windows: List[ProcessingWindow]) -> Iterator[Dict[str, Any]]:
+        """Yield each window in the legacy format, one at a time, for callers that write them out as they go."""
         for window in windows:
-            legacy_window = {
+            yield {
                 'window_analysis': {
                     'window': f"{window.window_number}/{len(windows)}",
                     'time_range': f"{window.start_time:.1f}s-{window.end_time:.1f}s"
                 },
-                'frame_descriptions': [
-                    {
-                        'timestamp': frame.timestamp,
-                        'forensic_description': frame.forensic_description,
-                        'applications': frame.applications,
-                        'ui_elements': frame.ui_elements,
-                        'user_actions': frame.user_actions
-                    }
-                    for frame in window.frame_descriptions
-                ]
+                'frame_descriptions': [frame.to_legacy_dict() for frame in window.frame_descriptions]
             }
-            legacy_windows.append(legacy_window)
 
+    def convert_to_legacy_format(self, windows: List[ProcessingWindow]) -> Dict[str, Any]:
+        """Convert enhanced windows to legacy format for backward compatibility."""
         return {
-            'windows': legacy_windows,
+            'windows': list(self.iter_legacy_windows(windows)),
             'window_seconds': self.window_seconds,
             'total_windows': len(windows)
-        }
\ No newline at end of file
+        }
@@ -5,12 +5,32 @@ Supports multiple JSON formats and creates time-based windows for analysis.
 
 import json
 import logging
+import orjson
+import re
+from bisect import bisect_left
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 from .utils import setup_logging, safe_json_parse, parse_time_to_seconds, format_timestamp
 
 logger = setup_logging(__name__)
 
+# Patterns used when summarising windows, compiled once at import
+_APP_CONTEXT_PATTERN = re.compile(r'(?:in |on |using |with )([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+_APP_SUFFIX_PATTERN = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:window|application|app)')
+
+_ACTIVITY_PATTERNS = [
+    (re.compile(pattern), activity) for pattern, activity in [
+        (r'typing|writing|entering', 'typing'),
+        (r'clicking|selecting|choosing', 'clicking'),
+        (r'scrolling|navigating|browsing', 'scrolling'),
+        (r'reading|reviewing|viewing', 'reading'),
+        (r'searching|finding|looking', 'searching'),
+        (r'copying|pasting|moving', 'copying'),
+        (r'opening|closing|switching', 'opening'),
+        (r'editing|modifying|changing', 'editing'),
+    ]
+]
+
 @dataclass
 class Frame:
     """Represents a single frame description."""
@@ -50,13 +70,13 @@ class FrameProcessor:
     def __init__(self):
         self.logger = logger
 
-    def parse_frame_descriptions(self, frame_data: Union[str, Dict]) -> List[Frame]:
+    def parse_frame_descriptions(self, frame_data: Union[str, bytes, Dict]) -> List[Frame]:
         """
         Parse frame descriptions from JSON input.
         Supports multiple input formats.
 
         Args:
-            frame_data: JSON string or parsed dictionary
+            frame_data: JSON string or UTF-8 bytes, or parsed dictionary
 
         Returns:
             List of normalized Frame objects
@@ -67,12 +87,12 @@ class FrameProcessor:
         try:
             self.logger.info("Parsing frame descriptions...")
 
-            # Parse JSON if string
-            if isinstance(frame_data, str):
-                success, parsed_data, error = safe_json_parse(frame_data)
-                if not success:
+            # Parse JSON if string or raw file bytes
+            if isinstance(frame_data, (str, bytes)):
+                try:
+                    data = orjson.loads(frame_data)
+                except orjson.JSONDecodeError as error:
                     raise ValueError(f"Invalid JSON format: {error}")
-                data = parsed_data
             else:
                 data = frame_data
 
@@ -306,6 +326,9 @@ class FrameProcessor:
 
             self.logger.info(f"Video duration: {total_duration:.1f} seconds ({total_duration/60:.2f} minutes)")
 
+            # Frames are sorted, so window bounds are found by bisection
+            timestamps = [f.timestamp for f in frames]
+
             # Create windows
             window_start = start_time
             window_index = 0
@@ -314,9 +337,8 @@ class FrameProcessor:
                 window_end = min(window_start + interval_seconds, end_time)
 
                 # Get frames for this window
-                window_frames = [
-                    f for f in frames
-                    if window_start <= f.timestamp < window_end
+                window_frames = frames[
+                    bisect_left(timestamps, window_start):bisect_left(timestamps, window_end)
                 ]
 
                 if window_frames:
@@ -364,16 +386,12 @@ class FrameProcessor:
                 if frame.application:
                     applications.add(frame.application)
 
-                # Try to extract app names from descriptions
-                app_patterns = [
-                    r'(?:in |on |using |with )([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-                    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:window|application|app)',
-                ]
-
-                for pattern in app_patterns:
-                    import re
-                    matches = re.findall(pattern, frame.description)
-                    applications.update(matches)
+                # Try to extract app names from descriptions; the suffix
+                # pattern can only match text containing "window" or "app"
+                description = frame.description
+                applications.update(_APP_CONTEXT_PATTERN.findall(description))
+                if 'window' in description or 'app' in description:
+                    applications.update(_APP_SUFFIX_PATTERN.findall(description))
 
             # Extract main activities
             main_activities = self._extract_main_activities(frames)
@@ -406,24 +424,13 @@ class FrameProcessor:
         """Extract main activities from frame descriptions."""
 
         activity_counts = {}
-        activity_patterns = [
-            (r'typing|writing|entering', 'typing'),
-            (r'clicking|selecting|choosing', 'clicking'),
-            (r'scrolling|navigating|browsing', 'scrolling'),
-            (r'reading|reviewing|viewing', 'reading'),
-            (r'searching|finding|looking', 'searching'),
-            (r'copying|pasting|moving', 'copying'),
-            (r'opening|closing|switching', 'opening'),
-            (r'editing|modifying|changing', 'editing'),
-        ]
 
         for frame in frames:
             # Safely handle description as string
             description = str(frame.description) if frame.description else ''
             description = description.lower()
-            for pattern, activity in activity_patterns:
-                import re
-                if re.search(pattern, description):
+            for pattern, activity in _ACTIVITY_PATTERNS:
+                if pattern.search(description):
                     activity_counts[activity] = activity_counts.get(activity, 0) + 1
 
         # Sort by frequency and return top 3
@@ -447,18 +454,20 @@ class FrameProcessor:
                 key_descriptions.append(frames[-1].description[:150])
 
         # Include longer descriptions (likely more detailed)
+        seen = set(key_descriptions)
         for frame in frames:
-            if (len(frame.description) > 100 and
-                frame.description not in key_descriptions and
-                len(key_descriptions) < 5):
+            if len(key_descriptions) >= 5:
+                break
+            if len(frame.description) > 100 and frame.description not in seen:
                 desc = frame.description[:150]
                 if len(frame.description) > 150:
                     desc += "..."
                 key_descriptions.append(desc)
+                seen.add(desc)
 
         return key_descriptions[:5]
 
-    def validate_frame_data(self, frame_data: Union[str, Dict]) -> Dict[str, Any]:
+    def validate_frame_data(self, frame_data: Union[str, bytes, Dict]) -> Dict[str, Any]:
         """
         Validate frame data structure.
 
@@ -466,8 +475,8 @@ class FrameProcessor:
             Dictionary with validation results
         """
         try:
-            # Parse if string
-            if isinstance(frame_data, str):
+            # Parse if string or raw file bytes
+            if isinstance(frame_data, (str, bytes)):
                 success, data, error = safe_json_parse(frame_data)
                 if not success:
                     return {
@@ -14,6 +14,11 @@ from openai.types import CompletionUsage
 
 from .database import GPTConfig
 from .enhanced_window_processor import ProcessingWindow
+from .response_cache import ResponseCache
+
+# GPT-5 completion token budget per verbosity level, and for other models/levels
+VERBOSITY_MAX_COMPLETION_TOKENS = {'low': 1000, 'medium': 2000, 'high': 4000}
+DEFAULT_MAX_COMPLETION_TOKENS = 2000
 
 
 @dataclass
@@ -43,9 +48,13 @@ class AnalysisResult:
 class GPT5Client:
     """GPT-5 client with Responses API and tool calling capabilities."""
 
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, client: Optional[OpenAI] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        # A caller-owned client keeps its connection pool (and TLS sessions) alive across instances
+        self.client = client or OpenAI(api_key=api_key)
         self.default_tools = self._setup_default_tools()
+        # Shared on-disk cache, so identical requests from later clients or runs reuse the analysis
+        self.response_cache = response_cache
 
     def _setup_default_tools(self) -> List[Dict[str, Any]]:
         """Setup default tools using Chat Completions API format."""
@@ -122,6 +131,13 @@ class GPT5Client:
             }
         ]
 
+    @staticmethod
+    def _max_completion_tokens(config: GPTConfig) -> int:
+        """Completion token limit for a request, scaled by verbosity for GPT-5 models."""
+        if config.model.startswith('gpt-5') and getattr(config, 'verbosity', None):
+            return VERBOSITY_MAX_COMPLETION_TOKENS.get(config.verbosity, DEFAULT_MAX_COMPLETION_TOKENS)
+        return DEFAULT_MAX_COMPLETION_TOKENS
+
     async def analyze_window_with_context(
         self,
         system_prompt: str,
@@ -137,6 +153,25 @@ class GPT5Client:
         # Prepare the user input combining context and window data
         user_input = self._prepare_window_input(context_prompt, window_data)
 
+        cache_key = None
+        if self.response_cache:
+            cache_key = ResponseCache.make_key('gpt5_analysis', config.model, config.reasoning_effort,
+                                               config.verbosity, self._max_completion_tokens(config),
+                                               system_prompt, user_input)
+            # SQLite calls block, so keep them off the event loop shared by concurrent sessions
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                logger.info("Reusing cached GPT-5 analysis for an identical request")
+                # No tokens were spent on a cache hit
+                return AnalysisResult(
+                    content=cached['content'],
+                    usage=None,
+                    processing_time_seconds=time.time() - start_time,
+                    model_used=cached['model_used'],
+                    reasoning_effort=cached['reasoning_effort'],
+                    verbosity=cached['verbosity']
+                )
+
         if progress_callback:
             progress_callback(f"Starting analysis with GPT-5 {config.model}")
 
@@ -163,6 +198,14 @@ class GPT5Client:
             if progress_callback:
                 progress_callback(f"Analysis completed in {processing_time:.1f}s")
 
+            if cache_key is not None:
+                await asyncio.to_thread(self.response_cache.put, cache_key, {
+                    'content': analysis_result.content,
+                    'model_used': analysis_result.model_used,
+                    'reasoning_effort': analysis_result.reasoning_effort,
+                    'verbosity': analysis_result.verbosity
+                })
+
             return analysis_result
 
         except Exception as e:
@@ -234,7 +277,7 @@ Structure your response with clear recommendations, implementation steps, and su
         request_params = {
             "model": config.model,
             "messages": messages,
-            "max_completion_tokens": 2000,  # GPT-5 uses max_completion_tokens instead of max_tokens
+            "max_completion_tokens": self._max_completion_tokens(config),  # GPT-5 uses max_completion_tokens instead of max_tokens
         }
 
         # Add GPT-5 specific parameters
@@ -247,14 +290,6 @@ Structure your response with clear recommendations, implementation steps, and su
             if hasattr(config, 'verbosity') and config.verbosity:
                 request_params["verbosity"] = config.verbosity
 
-                # Adjust max_completion_tokens based on verbosity for better responses
-                verbosity_tokens = {
-                    'low': 1000,
-                    'medium': 2000,
-                    'high': 4000
-                }
-                request_params["max_completion_tokens"] = verbosity_tokens.get(config.verbosity, 2000)
-
         # Add tools if enabled (temporarily disabled to test basic functionality)
         # if hasattr(self, 'default_tools') and self.default_tools:
         #     request_params["tools"] = self.default_tools
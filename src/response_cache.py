@@ -0,0 +1,135 @@
+"""
+Persistent response cache for repeat API requests.
+Stores recommendation responses on disk keyed by a digest of everything that shapes the request.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .config import Config
+from .utils import setup_logging
+
+logger = setup_logging(__name__)
+
+# Bump when the cached response format or key derivation changes so stale entries are never read back
+CACHE_SCHEMA_VERSION = 2
+
+def fingerprint(*parts: Any) -> str:
+    """Digest values into a short hex key, hashing strings directly rather than JSON-encoding them."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = part.encode('utf-8') if isinstance(part, str) else repr(part).encode('utf-8')
+        # Type tag and length prefix keep different part sequences from colliding
+        digest.update(type(part).__name__.encode('ascii') + b':' + len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+def default_response_cache(cache_dir: Optional[Union[str, Path]] = None) -> Optional['ResponseCache']:
+    """
+    Return the configured response cache, or None when caching is disabled.
+
+    Args:
+        cache_dir: Directory for the cache database (defaults to .llm_cache under the output directory)
+    """
+
+    if not Config.ENABLE_RESPONSE_CACHE:
+        return None
+    if cache_dir is None:
+        cache_dir = Path(Config.OUTPUT_DIR) / '.llm_cache'
+    return ResponseCache(cache_dir, Config.RESPONSE_CACHE_TTL_SECONDS)
+
+class ResponseCache:
+    """SQLite-backed response cache with per-entry expiry, shareable across processes."""
+
+    def __init__(self, cache_dir: Union[str, Path], default_ttl: float):
+        """
+        Initialize response cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            default_ttl: Seconds an entry stays valid unless put() overrides it
+        """
+        self.default_ttl = default_ttl
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "responses.db"
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Digest the request inputs, stamped with the current API settings, into a cache key."""
+
+        # Changing a configured default (model, effort, verbosity, token limit) starts a fresh keyspace
+        config_stamp = sorted(Config.get_api_settings().items())
+        return fingerprint(CACHE_SCHEMA_VERSION, config_stamp, *parts)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None when missing, expired or unreadable."""
+
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as error:
+            logger.warning(f"Response cache read failed: {error}")
+            return None
+
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError as error:
+            logger.warning(f"Ignoring unreadable response cache entry: {error}")
+            return None
+
+    def put(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Store a response under key for ttl seconds (default_ttl if not given), purging expired entries."""
+
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value, default=str), expires_at)
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as error:
+            logger.warning(f"Response cache write failed: {error}")
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM responses")
+        finally:
+            conn.close()
@@ -4,13 +4,18 @@ Utility functions for the AI Coaching Framework.
 
 import json
 import logging
+import orjson
 import re
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 from .config import Config
 
+# Keyword arguments for @dataclass: slots (3.10+ only) drop the per-instance __dict__ on hot record types
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 def setup_logging(name: str) -> logging.Logger:
     """Set up logging for a module."""
 
@@ -38,17 +43,17 @@ def setup_logging(name: str) -> logging.Logger:
 
     return logger
 
-def safe_json_parse(json_string: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
+def safe_json_parse(json_string: Union[str, bytes]) -> Tuple[bool, Optional[Dict], Optional[str]]:
     """
-    Safely parse JSON string.
+    Safely parse JSON string or UTF-8 bytes.
 
     Returns:
         Tuple of (success, data, error_message)
     """
     try:
-        data = json.loads(json_string)
+        data = orjson.loads(json_string)
         return True, data, None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         return False, None, str(e)
 
 def safe_json_stringify(obj: Any, pretty: bool = False) -> Tuple[bool, Optional[str], Optional[str]]:
@@ -89,6 +89,7 @@ def test_basic_functionality():
         print("  ✅ Configuration objects created")
 
         # Clean up
+        db_manager.close()
         if os.path.exists(db_path):
             os.remove(db_path)
 
@@ -65,6 +65,7 @@ def test_database_basic():
             result = False
 
         # Cleanup
+        db_manager.close()
         if os.path.exists(db_path):
             os.remove(db_path)
 
@@ -189,6 +190,7 @@ def test_context_manager_basic():
             result = False
 
         # Cleanup
+        db_manager.close()
         if os.path.exists(db_path):
             os.remove(db_path)
 
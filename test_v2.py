@@ -120,6 +120,7 @@ def test_database_operations():
 
     # Cleanup
     db_manager.delete_session(session_id)
+    db_manager.close()
     if os.path.exists(db_path):
         os.remove(db_path)
 
@@ -235,6 +236,7 @@ def test_context_manager():
 
     finally:
         os.remove(temp_file)
+        db_manager.close()
         if os.path.exists(db_path):
             os.remove(db_path)
 
@@ -316,6 +318,7 @@ def test_batch_processor_setup():
         print("  ✅ Cleanup function successful")
 
     finally:
+        db_manager.close()
         if os.path.exists(db_path):
             os.remove(db_path)
 
@@ -380,9 +383,10 @@ def run_integration_test():
     if os.path.exists(db_path):
         os.remove(db_path)
 
+    db_manager = DatabaseManager(db_path)
+
     try:
         # Initialize components
-        db_manager = DatabaseManager(db_path)
         processor = EnhancedWindowProcessor(window_seconds=30)
         context_manager = ContextManager(db_manager)
 
@@ -443,6 +447,7 @@ def run_integration_test():
             os.remove(temp_file)
 
     finally:
+        db_manager.close()
         if os.path.exists(db_path):
             os.remove(db_path)
 
@@ -4,7 +4,10 @@ Run with: python -m pytest tests/test_framework.py -v
 """
 
 import pytest
+import asyncio
 import json
+import sqlite3
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -12,6 +15,13 @@ from src.config import Config
 from src.frame_processor import FrameProcessor
 from src.prompt_manager import PromptManager
 from src.window_manager import WindowManager
+from src.enhanced_window_processor import EnhancedWindowProcessor, FrameDescription, ProcessingWindow, MAX_WINDOWS
+from src.context_manager import ContextManager
+from src.api_client import APIClient, RateLimiter
+from src.coaching_engine import CoachingEngine
+from src.gpt5_client import GPT5Client
+from src.response_cache import ResponseCache
+from src.database import DatabaseManager, GPTConfig, ProcessingConfig, SessionStatus, WindowStatus
 from src.utils import safe_json_parse, format_timestamp, parse_time_to_seconds
 
 class TestFrameProcessor:
@@ -255,6 +265,432 @@ class TestConfig:
         Config.OPENAI_API_KEY = ''
         assert Config.validate_api_key() is False
 
+class TestDatabaseManager:
+    """Test session storage and transactions."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.gpt_config = GPTConfig()
+        self.processing_config = ProcessingConfig()
+
+    def test_transaction_commits_grouped_writes(self, tmp_path):
+        """Test that writes inside a transaction are committed together."""
+        db = DatabaseManager(str(tmp_path / "sessions.db"))
+        db.create_session("s1", "Session", self.gpt_config, self.processing_config)
+
+        with db.transaction():
+            db.update_session_status("s1", SessionStatus.PROCESSING, completed_windows=1)
+            db.save_recommendations("s1", 1, [{'recommendation_text': 'Use shortcuts'}])
+
+        assert db.get_session("s1")['completed_windows'] == 1
+        assert len(db.get_session_recommendations("s1")) == 1
+
+    def test_transaction_rolls_back_on_error(self, tmp_path):
+        """Test that a failing block leaves no partial writes behind."""
+        db = DatabaseManager(str(tmp_path / "sessions.db"))
+        db.create_session("s1", "Session", self.gpt_config, self.processing_config)
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.update_session_status("s1", SessionStatus.COMPLETED, completed_windows=5)
+                raise RuntimeError("abort")
+
+        session = db.get_session("s1")
+        assert session['status'] == SessionStatus.CREATED.value
+        assert session['completed_windows'] == 0
+
+    def test_iter_session_windows_allows_writes_between_windows(self, tmp_path):
+        """Test that windows stream in order while the caller updates them."""
+        db = DatabaseManager(str(tmp_path / "sessions.db"))
+        for window_number in (2, 1, 3):
+            db.create_window(f"w{window_number}", "s1", window_number, 0.0, 30.0, {'n': window_number})
+
+        seen = []
+        for window in db.iter_session_windows("s1"):
+            seen.append(window.input_data['n'])
+            db.update_window_status(window.id, WindowStatus.COMPLETED)
+
+        assert seen == [1, 2, 3]
+        assert db.get_window_status_counts("s1") == {'completed': 3}
+        assert [w['status'] for w in db.get_session_windows("s1")] == ['completed'] * 3
+
+    def test_cached_lookups_follow_writes(self, tmp_path):
+        """Test that cached session and context lookups are refreshed by writes."""
+        db = DatabaseManager(str(tmp_path / "sessions.db"))
+        db.create_session("s1", "Session", self.gpt_config, self.processing_config)
+        db.save_context_summary("c1", "s1", 1, {'step': 'first'})
+
+        assert db.get_session("s1")['status'] == SessionStatus.CREATED.value
+        assert db.get_context_summary("s1", 1)['summary_data'] == {'step': 'first'}
+
+        db.update_session_status("s1", SessionStatus.PROCESSING)
+        db.save_context_summary("c1", "s1", 1, {'step': 'second'})
+
+        assert db.get_session("s1")['status'] == SessionStatus.PROCESSING.value
+        assert db.get_context_summary("s1", 1)['summary_data'] == {'step': 'second'}
+
+        db.delete_session("s1")
+        assert db.get_session("s1") is None
+
+    def test_list_active_sessions_skips_finished_sessions(self, tmp_path):
+        """Test that only sessions that can still progress are listed as active."""
+        db = DatabaseManager(str(tmp_path / "sessions.db"))
+        for session_id, status in (("s1", SessionStatus.PROCESSING), ("s2", SessionStatus.COMPLETED),
+                                   ("s3", SessionStatus.PAUSED), ("s4", SessionStatus.FAILED)):
+            db.create_session(session_id, session_id, self.gpt_config, self.processing_config)
+            db.update_session_status(session_id, status)
+
+        assert sorted(s['id'] for s in db.list_active_sessions()) == ["s1", "s3"]
+        assert [s['id'] for s in db.list_sessions(SessionStatus.COMPLETED)] == ["s2"]
+
+class TestEnhancedWindowProcessor:
+    """Test time-based windowing of frame description dumps."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = EnhancedWindowProcessor(window_seconds=30)
+
+        self.frames = [
+            {"timestamp": "00:00:05", "forensic_description": "Opening Excel", "applications": ["Excel"]},
+            {"timestamp": "00:00:20", "forensic_description": "Typing headers", "applications": ["Excel"]},
+            {"timestamp": "00:01:10", "forensic_description": "Saving workbook", "applications": ["Excel"]}
+        ]
+
+    def test_jsonl_streaming_matches_json_windows(self, tmp_path):
+        """Test that streamed JSONL windows match the fully-loaded JSON path."""
+        json_file = tmp_path / "frames.json"
+        json_file.write_text(json.dumps({"video": "demo.mp4", "windows": [{"frame_descriptions": self.frames}]}))
+
+        jsonl_file = tmp_path / "frames.jsonl"
+        jsonl_file.write_text("\n".join(json.dumps(record) for record in [{"video": "demo.mp4"}] + self.frames))
+
+        frames, metadata = self.processor.load_frame_descriptions_from_json(str(json_file))
+        expected = [w.to_dict() for w in self.processor.create_windows_from_frames(frames)]
+        streamed = [w.to_dict() for w in self.processor.iter_session_windows(str(jsonl_file))]
+
+        assert streamed == expected
+        assert [w.to_dict() for w in self.processor.iter_windows_from_json(str(json_file))] == expected
+        assert [w['frame_count'] for w in streamed] == [2, 0, 1]
+        assert self.processor.load_jsonl_metadata(str(jsonl_file))['video'] == "demo.mp4"
+
+    def test_jsonl_streaming_caps_windows_and_drops_late_frames(self, tmp_path):
+        """Test that a far-off timestamp cannot fan out windows and late frames are not misplaced."""
+        jsonl_file = tmp_path / "frames.jsonl"
+        jsonl_file.write_text("\n".join(json.dumps(frame) for frame in [
+            {"timestamp": "00:00:40", "forensic_description": "Reading email"},
+            {"timestamp": "00:00:10", "forensic_description": "Late frame"},
+            {"timestamp": "27:46:40", "forensic_description": "Corrupt timestamp"}
+        ]))
+
+        windows = list(self.processor.iter_session_windows(str(jsonl_file)))
+
+        assert len(windows) <= MAX_WINDOWS
+        assert [w.window_number for w in windows] == [1, 2]
+        assert windows[0].frame_descriptions == []
+        assert [f.forensic_description for f in windows[1].frame_descriptions] == ["Reading email"]
+
+    def test_validate_jsonl_structure(self, tmp_path):
+        """Test JSONL validation only needs the first frame record."""
+        jsonl_file = tmp_path / "frames.jsonl"
+        jsonl_file.write_text("\n".join(json.dumps(frame) for frame in self.frames))
+
+        is_valid, _ = self.processor.validate_json_structure(str(jsonl_file))
+        assert is_valid is True
+
+        jsonl_file.write_text(json.dumps({"timestamp": "00:00:01"}))
+        is_valid, message = self.processor.validate_json_structure(str(jsonl_file))
+        assert is_valid is False
+        assert 'forensic_description' in message
+
+    def test_aggregate_windows_matches_per_window_context(self):
+        """Test that incrementally aggregated sliding windows match fresh extraction."""
+        frames = [
+            FrameDescription.from_dict({
+                'timestamp': str(second), 'forensic_description': f"Step {second} " + "x" * 60,
+                'applications': [app], 'ui_elements': [], 'user_actions': [f"click {second % 3}"],
+                'raw_timestamp_seconds': float(second)
+            })
+            for second, app in enumerate(["Excel", "Excel", "Chrome", "Slack", "Excel", "Chrome"])
+        ]
+        # Overlapping 3-second windows advancing one second at a time, then a disjoint one
+        windows = [
+            ProcessingWindow(window_number=start + 1, start_time=float(start), end_time=float(start + 3),
+                             frame_descriptions=[f for f in frames if start <= f.raw_timestamp_seconds < start + 3])
+            for start in (0, 1, 2, 3, 10)
+        ]
+
+        incremental = list(self.processor.aggregate_windows(windows))
+        fresh = [self.processor.extract_window_context(window) for window in windows]
+
+        # Tag order may differ after frames leave, so compare contents
+        for got, expected in zip(incremental, fresh):
+            assert {key: sorted(value) if isinstance(value, list) else value for key, value in got.items()} == \
+                {key: sorted(value) if isinstance(value, list) else value for key, value in expected.items()}
+        assert sorted(incremental[2]['applications_used']) == ["Chrome", "Excel", "Slack"]
+        assert fresh[0]['workflow_summary'].startswith("Working in Excel, Chrome")
+        assert incremental[4]['workflow_summary'] == "No activity detected in this window"
+
+class TestContextManager:
+    """Test rolling context across windows."""
+
+    def _save_window(self, manager, window_number):
+        window_context = {'applications': [f"App{window_number}", "Shared"], 'workflow_description': f"Step {window_number}"}
+        manager.save_window_context("s1", window_number, window_context, f"### Recommendation Tip {window_number}")
+
+    def test_rolling_context_reads_each_summary_once(self, tmp_path):
+        """Test that only newly completed windows are read and old ones drop out of the aggregate."""
+        db = DatabaseManager(str(tmp_path / "sessions.db"))
+        manager = ContextManager(db, max_context_windows=2)
+
+        with patch.object(db, 'get_context_summaries_range', wraps=db.get_context_summaries_range) as get_range:
+            for window_number in range(1, 5):
+                manager._get_previous_summaries("s1", window_number)
+                self._save_window(manager, window_number)
+            summaries = manager._get_previous_summaries("s1", 5)
+
+        # One single-window query per step, each for the window saved just before
+        assert [c.args[1:] for c in get_range.call_args_list] == [(1, 1), (2, 2), (3, 3), (4, 4)]
+        assert len(summaries) == 2
+        tools, patterns, recommendations = manager._rolling_context["s1"].aggregates()
+        assert sorted(tools) == ["App3", "App4", "Shared"]
+        assert sorted(recommendations) == ["Tip 3", "Tip 4"]
+
+    def test_workflow_summary_aggregates_in_database(self, tmp_path):
+        """Test that the session summary unions tools and patterns and counts categories."""
+        db = DatabaseManager(str(tmp_path / "sessions.db"))
+        manager = ContextManager(db)
+
+        for window_number in range(1, 4):
+            db.create_window(f"w{window_number}", "s1", window_number, 0.0, 60.0, {})
+            self._save_window(manager, window_number)
+        self._save_window(manager, 3)
+        db.update_window_status("w1", WindowStatus.COMPLETED)
+
+        summary = manager.get_session_workflow_summary("s1")
+
+        assert summary['tools_identified'] == ["App1", "App2", "App3", "Shared"]
+        assert summary['workflow_patterns'] == ["Step 1", "Step 2", "Step 3"]
+        assert summary['recommendation_categories'] == {'general': 3}
+        assert summary['total_recommendations'] == 3
+        assert summary['processing_status'] == {'total_windows': 3, 'completed_windows': 1}
+
+class TestGPT5Client:
+    """Test GPT-5 client request handling."""
+
+    def test_identical_request_served_from_response_cache(self, tmp_path):
+        """Test that a fresh client reuses a repeated request's analysis and a changed prompt does not."""
+        openai_client = Mock()
+        openai_client.chat.completions.create.return_value = Mock(
+            choices=[Mock(message=Mock(content="Use shortcuts"))], usage=None
+        )
+        response_cache = ResponseCache(tmp_path, default_ttl=60)
+        config = GPTConfig()
+
+        def analyze(context_prompt):
+            # Callers build a client per request, so only the shared cache carries over
+            client = GPT5Client(api_key="test-key", client=openai_client, response_cache=response_cache)
+            return asyncio.run(client.analyze_window_with_context("system", context_prompt, {}, config))
+
+        first = analyze("context")
+        second = analyze("context")
+        analyze("other context")
+
+        assert first.content == second.content == "Use shortcuts"
+        assert openai_client.chat.completions.create.call_count == 2
+
+class TestResponseCache:
+    """Test the persistent response cache."""
+
+    def test_expired_entries_purged_and_corrupt_entries_missed(self, tmp_path):
+        """Test writes purge expired rows and an unreadable row reads as a miss."""
+        cache = ResponseCache(tmp_path, default_ttl=60)
+        cache.put("expired", {"content": "old"}, ttl=-1)
+        cache.put("fresh", {"content": "new"})
+
+        with sqlite3.connect(cache.db_path) as conn:
+            assert [row[0] for row in conn.execute("SELECT key FROM responses")] == ["fresh"]
+            conn.execute("UPDATE responses SET value = 'not json' WHERE key = 'fresh'")
+
+        assert cache.get("fresh") is None
+
+    def test_key_changes_with_configured_api_settings(self):
+        """Test that changing a configured default invalidates earlier keys."""
+        key = ResponseCache.make_key("system", "prompt")
+        with patch.object(Config, 'DEFAULT_MODEL', 'other-model'):
+            assert ResponseCache.make_key("system", "prompt") != key
+        assert ResponseCache.make_key("system", "prompt") == key
+
+class TestRateLimiter:
+    """Test the adaptive request rate limiter."""
+
+    def test_penalize_halves_rate_and_honors_retry_after(self):
+        """Test a rate-limit response slows the limiter and blocks until Retry-After passes."""
+        limiter = RateLimiter(max_per_minute=6000)
+
+        limiter.penalize(retry_after=0.2)
+        assert limiter.rate == limiter.max_rate / 2
+
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.2
+
+    def test_rate_recovers_after_cooldown(self):
+        """Test the rate doubles back toward the maximum once the cooldown has passed."""
+        limiter = RateLimiter(max_per_minute=6000, cooldown_seconds=0.05)
+        limiter.penalize()
+        limiter.penalize()
+
+        time.sleep(0.06)
+        limiter.acquire()
+        assert limiter.rate == limiter.max_rate / 2
+
+class TestAPIClient:
+    """Test API call retry handling."""
+
+    @patch('src.api_client.time.sleep')
+    def test_rate_limit_without_retry_after_backs_off(self, sleep):
+        """Test a 429 with no Retry-After header waits before retrying."""
+        from openai import RateLimitError
+
+        # A 429 whose response carries no Retry-After header
+        rate_limited = RateLimitError.__new__(RateLimitError)
+        rate_limited.response = Mock(headers={})
+
+        client = APIClient(api_key="test-key")
+        client.max_retries = 3
+        client.client = Mock()
+        client.client.chat.completions.create.side_effect = [
+            rate_limited, rate_limited, Mock(model_dump=Mock(return_value={"ok": True}))
+        ]
+
+        assert client._make_api_call_with_retry({"model": "gpt-5"}) == {"ok": True}
+        assert [c.args[0] for c in sleep.call_args_list] == [client.retry_delay, client.retry_delay * 2]
+
+class TestCoachingEngine:
+    """Test window analysis orchestration with a stubbed API client."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.frame_data = {
+            "frames": [{"timestamp": t, "description": f"Editing report section {t}"} for t in range(0, 300, 30)]
+        }
+
+    @patch('src.coaching_engine.APIClient')
+    def test_stream_yields_windows_in_order(self, mock_client_class, mock_api_response, tmp_path):
+        """Test concurrent analysis still yields results in window order and records the session."""
+        mock_client_class.return_value.generate_recommendation.return_value = mock_api_response
+
+        with patch.object(Config, 'OUTPUT_DIR', str(tmp_path)), patch.object(Config, 'MAX_CONCURRENCY', 3):
+            engine = CoachingEngine(api_key="test-key")
+            results = list(engine.analyze_frames_stream(self.frame_data, interval_minutes=1))
+
+        assert [r.window_index for r in results] == list(range(len(results)))
+        assert engine.current_session.recommendations == results
+        assert engine.current_session.successful_windows == len(results) == 5
+
+    @patch('src.coaching_engine.APIClient')
+    def test_analyze_frames_callable_from_async_code(self, mock_client_class, mock_api_response, tmp_path):
+        """Test the synchronous entry point still works while an event loop is running."""
+        mock_client_class.return_value.generate_recommendation.return_value = mock_api_response
+
+        async def analyze():
+            engine = CoachingEngine(api_key="test-key")
+            return engine.analyze_frames(self.frame_data, interval_minutes=1)
+
+        with patch.object(Config, 'OUTPUT_DIR', str(tmp_path)), patch.object(Config, 'MAX_CONCURRENCY', 3):
+            session = asyncio.run(analyze())
+
+        assert session.successful_windows == session.total_windows == 5
+
+    @patch('src.coaching_engine.APIClient')
+    def test_repeat_analysis_served_from_response_cache(self, mock_client_class, mock_api_response, tmp_path):
+        """Test identical requests reuse the cached response instead of calling the API again."""
+        generate = mock_client_class.return_value.generate_recommendation
+        generate.return_value = mock_api_response
+
+        with patch.object(Config, 'OUTPUT_DIR', str(tmp_path)):
+            engine = CoachingEngine(api_key="test-key")
+            first = engine.analyze_frames(self.frame_data, interval_minutes=1)
+            calls = generate.call_count
+            second = engine.analyze_frames(self.frame_data, interval_minutes=1)
+
+        assert calls == first.total_windows
+        assert generate.call_count == calls
+        assert [r.recommendation for r in second.recommendations] == [r.recommendation for r in first.recommendations]
+
+    @patch('src.coaching_engine.APIClient')
+    def test_resume_skips_checkpointed_windows(self, mock_client_class, mock_api_response, tmp_path):
+        """Test an interrupted session resumes from its checkpoint without redoing finished windows."""
+        generate = mock_client_class.return_value.generate_recommendation
+        generate.side_effect = [mock_api_response, mock_api_response, RuntimeError("connection reset")]
+
+        with patch.object(Config, 'OUTPUT_DIR', str(tmp_path)), \
+             patch.object(Config, 'ENABLE_RESPONSE_CACHE', False):
+            engine = CoachingEngine(api_key="test-key")
+            stream = engine.analyze_frames_stream(self.frame_data, interval_minutes=1, session_id="resume_test")
+            interrupted = [next(stream), next(stream)]
+            stream.close()
+
+            generate.side_effect = None
+            generate.return_value = mock_api_response
+            generate.reset_mock()
+            session = engine.analyze_frames(self.frame_data, interval_minutes=1, session_id="resume_test")
+
+        assert [r.window_index for r in interrupted] == [0, 1]
+        assert generate.call_count == session.total_windows - 2
+        assert session.successful_windows == session.total_windows
+        assert (tmp_path / "sessions" / "resume_test.jsonl").exists()
+        assert not (tmp_path / "sessions" / "resume_test.partial.jsonl").exists()
+
+    @patch('src.coaching_engine.APIClient')
+    def test_batch_resume_submits_only_unfinished_windows(self, mock_client_class, mock_api_response, tmp_path):
+        """Test a resumed batch-mode session does not resubmit checkpointed windows."""
+        api_client = mock_client_class.return_value
+        api_client.generate_recommendation.side_effect = [mock_api_response, mock_api_response, RuntimeError("connection reset")]
+        api_client.build_batch_request.side_effect = lambda custom_id, **kwargs: {'custom_id': custom_id}
+        api_client.submit_batch.return_value = {'id': 'batch_1', 'status': 'completed'}
+        api_client.read_batch_results.side_effect = lambda batch, settings, start: {
+            f"win-{i}": mock_api_response for i in range(5)
+        }
+
+        with patch.object(Config, 'OUTPUT_DIR', str(tmp_path)), \
+             patch.object(Config, 'ENABLE_RESPONSE_CACHE', False):
+            engine = CoachingEngine(api_key="test-key")
+            stream = engine.analyze_frames_stream(self.frame_data, interval_minutes=1, session_id="batch_resume")
+            interrupted = [next(stream), next(stream)]
+            stream.close()
+
+            session = engine.analyze_frames(self.frame_data, interval_minutes=1, session_id="batch_resume",
+                                            api_settings={'batch': True})
+
+        submitted = [call.kwargs['custom_id'] for call in api_client.build_batch_request.call_args_list]
+        assert submitted == ["win-2", "win-3", "win-4"]
+        assert session.recommendations[:2] == interrupted
+        assert [r.window_index for r in session.recommendations] == list(range(5))
+        assert session.successful_windows == session.total_windows
+
+    @patch('src.coaching_engine.APIClient')
+    def test_resume_with_changed_settings_starts_over(self, mock_client_class, mock_api_response, tmp_path):
+        """Test a checkpoint written under different settings is set aside instead of reused."""
+        generate = mock_client_class.return_value.generate_recommendation
+        generate.return_value = mock_api_response
+
+        with patch.object(Config, 'OUTPUT_DIR', str(tmp_path)), \
+             patch.object(Config, 'ENABLE_RESPONSE_CACHE', False):
+            engine = CoachingEngine(api_key="test-key")
+            stream = engine.analyze_frames_stream(self.frame_data, interval_minutes=1, session_id="changed")
+            next(stream)
+            stream.close()
+
+            generate.reset_mock()
+            session = engine.analyze_frames(
+                self.frame_data, interval_minutes=1, session_id="changed",
+                api_settings={'reasoning_effort': 'high'}
+            )
+
+        assert generate.call_count == session.total_windows
+        assert (tmp_path / "sessions" / "changed.partial.stale").exists()
+
 # Integration test
 class TestIntegration:
     """Integration tests for the complete framework."""